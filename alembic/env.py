@@ -32,7 +32,7 @@ target_metadata = Base.metadata
 
 
 def get_url():
-    return settings.database_url
+    return settings.DATABASE_URL
 
 
 def run_migrations_offline() -> None:
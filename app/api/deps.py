@@ -1,15 +1,21 @@
 from typing import Optional
-from fastapi import Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import HTTPException, status, Request
+from app.core.database import AsyncSessionLocal
 from app.core.security import get_token_from_request, verify_token
 from app.models.employee import Employee
+from app.services.principal_cache import principal_cache
 from app.utils.errors import AppException
 
-async def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db),
-) -> Optional[Employee]:
+async def get_current_user(request: Request) -> Optional[Employee]:
+    # Resolve once per request, however many auth dependencies ask
+    if hasattr(request.state, "current_user"):
+        return request.state.current_user
+    
+    user = await _resolve_current_user(request)
+    request.state.current_user = user
+    return user
+
+async def _resolve_current_user(request: Request) -> Optional[Employee]:
     token = get_token_from_request(request)
     if not token:
         return None
@@ -22,17 +28,25 @@ async def get_current_user(
     if not user_id:
         return None
     
+    user = principal_cache.get(user_id)
+    if user is not None:
+        return user
+    
     try:
-        user = db.query(Employee).filter(Employee.id == user_id).first()
+        # A short-lived session, back in the pool before the endpoint runs, so
+        # endpoints on either get_db or get_async_db hold one connection at a time
+        async with AsyncSessionLocal() as db:
+            user = await db.get(Employee, user_id)
         if not user or user.status.value != "active":
             return None
         
+        principal_cache.put(user)
         return user
     except Exception:
         return None
 
-async def require_auth(request: Request, db: Session = Depends(get_db)) -> Employee:
-    user = await get_current_user(request, db)
+async def require_auth(request: Request) -> Employee:
+    user = await get_current_user(request)
     if not user:
         raise AppException(
             code="UNAUTHORIZED",
@@ -41,8 +55,8 @@ async def require_auth(request: Request, db: Session = Depends(get_db)) -> Emplo
         )
     return user
 
-async def require_admin(request: Request, db: Session = Depends(get_db)) -> Employee:
-    user = await require_auth(request, db)
+async def require_admin(request: Request) -> Employee:
+    user = await require_auth(request)
     if user.role.value != "admin":
         raise AppException(
             code="PERMISSION_DENIED",
@@ -1,15 +1,48 @@
-from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, leads, developers, contacts, projects, inventory, land, pending_actions, documents
-
-api_router = APIRouter()
-
-api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(leads.router, prefix="/leads", tags=["leads"])
-api_router.include_router(developers.router, prefix="/developers", tags=["developers"])
-api_router.include_router(contacts.router, prefix="/contacts", tags=["contacts"])
-api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
-api_router.include_router(inventory.router, prefix="/inventory", tags=["inventory"])
-api_router.include_router(land.router, prefix="/land", tags=["land"])
-api_router.include_router(pending_actions.router, prefix="/pending-actions", tags=["pending-actions"])
-api_router.include_router(documents.router, tags=["documents"])
\ No newline at end of file
+import importlib
+from typing import Any, Dict
+from fastapi import APIRouter, FastAPI
+
+# (endpoint module, prefix, tag); the modules are only imported when the router is built
+ENDPOINTS = (
+    ("auth", "/auth", "authentication"),
+    ("users", "/users", "users"),
+    ("leads", "/leads", "leads"),
+    ("developers", "/developers", "developers"),
+    ("contacts", "/contacts", "contacts"),
+    ("projects", "/projects", "projects"),
+    ("inventory", "/inventory", "inventory"),
+    ("land", "/land", "land"),
+    ("pending_actions", "/pending-actions", "pending-actions"),
+    ("documents", "", "documents"),
+    ("search", "/search", "search"),
+    ("metrics", "/metrics", "metrics"),
+    ("jobs", "/jobs", "jobs"),
+)
+
+def build_api_router() -> APIRouter:
+    """Import every endpoint module and collect its routes"""
+    api_router = APIRouter()
+    for module, prefix, tag in ENDPOINTS:
+        endpoints = importlib.import_module(f"app.api.v1.endpoints.{module}")
+        api_router.include_router(endpoints.router, prefix=prefix, tags=[tag])
+    return api_router
+
+class LazyAPIApp(FastAPI):
+    """
+    FastAPI app that registers the v1 API on first use (lifespan startup,
+    first request or OpenAPI schema) rather than when it is imported
+    """
+    api_loaded = False
+
+    def load_api(self) -> None:
+        if not self.api_loaded:
+            self.include_router(build_api_router(), prefix="/api/v1")
+            self.api_loaded = True
+
+    async def __call__(self, scope, receive, send) -> None:
+        self.load_api()
+        await super().__call__(scope, receive, send)
+
+    def openapi(self) -> Dict[str, Any]:
+        self.load_api()
+        return super().openapi()
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.core.security import (
-    verify_password, 
+    verify_password_async, 
     create_access_token, 
     set_auth_cookie, 
-    clear_auth_cookie, 
-    check_rate_limit
+    clear_auth_cookie
 )
+from app.core.rate_limit import rate_limiter
 from app.core.config import settings
 from app.models.employee import Employee
 from app.schemas.employee import EmployeeLogin, Token, EmployeeResponse
@@ -21,11 +22,12 @@ async def login(
     request: Request,
     response: Response,
     login_data: EmployeeLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Rate limiting
     client_ip = request.client.host if request.client else "unknown"
-    if not check_rate_limit(f"login:{client_ip}", settings.RATE_LIMIT_LOGIN):
+    limit = await rate_limiter.hit(f"login:{client_ip}", settings.RATE_LIMIT_LOGIN, 60)
+    if not limit.allowed:
         raise AppException(
             code="RATE_LIMITED",
             message="Too many login attempts. Please try again later.",
@@ -33,7 +35,7 @@ async def login(
         )
     
     # Get user from database
-    user = db.query(Employee).filter(Employee.username == login_data.username).first()
+    user = (await db.execute(select(Employee).where(Employee.username == login_data.username))).scalar_one_or_none()
     if not user:
         raise AppException(
             code="INVALID_CREDENTIALS",
@@ -42,7 +44,7 @@ async def login(
         )
     
     # Verify password
-    if not verify_password(login_data.password, user.password_hash):
+    if not await verify_password_async(login_data.password, user.password_hash):
         raise AppException(
             code="INVALID_CREDENTIALS",
             message="Invalid username or password",
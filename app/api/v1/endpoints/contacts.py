@@ -1,9 +1,13 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.utils.pagination import apply_keyset_order, fetch_keyset_page
+from app.api.deps import get_current_user, require_auth
+from app.services.export_service import export_response, table_columns
 from app.models.user import User
+from app.models.employee import Employee
 from app.models.contact import Contact
 from app.schemas.contact import ContactCreate, ContactUpdate, ContactResponse
 import uuid
@@ -13,8 +17,10 @@ router = APIRouter()
 
 @router.get("/", response_model=List[ContactResponse])
 def read_contacts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
     type_filter: Optional[str] = Query(None, alias="type"),
     city_filter: Optional[str] = Query(None, alias="city"),
     db: Session = Depends(get_db),
@@ -28,10 +34,34 @@ def read_contacts(
     if city_filter:
         query = query.filter(Contact.city.ilike(f"%{city_filter}%"))
     
-    contacts = query.offset(skip).limit(limit).all()
+    if cursor is None:
+        contacts = query.offset(skip).limit(limit).all()
+        return contacts
+    
+    # Keyset pagination, newest first; the next cursor is returned in a header
+    query = apply_keyset_order(query, Contact, "created_at", "desc")
+    contacts, next_cursor = fetch_keyset_page(query, Contact, "created_at", "desc", limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return contacts
 
 
+@router.get("/export")
+async def export_contacts(
+    request: Request,
+    type_filter: Optional[str] = Query(None, alias="type"),
+    city_filter: Optional[str] = Query(None, alias="city"),
+    format: str = Query("csv", regex="^(csv|parquet|arrow)$", description="Export format: csv|parquet|arrow"),
+    current_user: Employee = Depends(require_auth)
+):
+    statement = select(*table_columns(Contact)).order_by(Contact.created_at.desc())
+    if type_filter:
+        statement = statement.where(Contact.type == type_filter)
+    if city_filter:
+        statement = statement.where(Contact.city.ilike(f"%{city_filter}%"))
+    return export_response(request, statement, "contacts", format)
+
+
 @router.post("/", response_model=ContactResponse)
 def create_contact(
     contact: ContactCreate,
@@ -1,9 +1,13 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.utils.pagination import apply_keyset_order, fetch_keyset_page
+from app.api.deps import get_current_user, require_auth
+from app.services.export_service import export_response, table_columns
 from app.models.user import User
+from app.models.employee import Employee
 from app.models.developer import Developer
 from app.schemas.developer import DeveloperCreate, DeveloperUpdate, DeveloperResponse
 import uuid
@@ -13,8 +17,10 @@ router = APIRouter()
 
 @router.get("/", response_model=List[DeveloperResponse])
 def read_developers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
     type_filter: Optional[str] = Query(None, alias="type"),
     grade_filter: Optional[str] = Query(None, alias="grade"),
     city_filter: Optional[str] = Query(None, alias="city"),
@@ -31,10 +37,37 @@ def read_developers(
     if city_filter:
         query = query.filter(Developer.ho_city.ilike(f"%{city_filter}%"))
     
-    developers = query.offset(skip).limit(limit).all()
+    if cursor is None:
+        developers = query.offset(skip).limit(limit).all()
+        return developers
+    
+    # Keyset pagination, newest first; the next cursor is returned in a header
+    query = apply_keyset_order(query, Developer, "created_at", "desc")
+    developers, next_cursor = fetch_keyset_page(query, Developer, "created_at", "desc", limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return developers
 
 
+@router.get("/export")
+async def export_developers(
+    request: Request,
+    type_filter: Optional[str] = Query(None, alias="type"),
+    grade_filter: Optional[str] = Query(None, alias="grade"),
+    city_filter: Optional[str] = Query(None, alias="city"),
+    format: str = Query("csv", regex="^(csv|parquet|arrow)$", description="Export format: csv|parquet|arrow"),
+    current_user: Employee = Depends(require_auth)
+):
+    statement = select(*table_columns(Developer)).order_by(Developer.created_at.desc())
+    if type_filter:
+        statement = statement.where(Developer.type == type_filter)
+    if grade_filter:
+        statement = statement.where(Developer.grade == grade_filter)
+    if city_filter:
+        statement = statement.where(Developer.ho_city.ilike(f"%{city_filter}%"))
+    return export_response(request, statement, "developers", format)
+
+
 @router.post("/", response_model=DeveloperResponse)
 def create_developer(
     developer: DeveloperCreate,
@@ -1,17 +1,53 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, Query, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, Form, Query, Request
+from fastapi.responses import FileResponse, RedirectResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db
 from app.models.document import Document
-from app.schemas.document import DocumentResponse, DocumentsListResponse
+from app.core.security import create_signed_token, read_signed_token
+from app.schemas.document import (
+    KEY_SEGMENT_PATTERN,
+    DocumentCompleteRequest,
+    DocumentPresignRequest,
+    DocumentResponse,
+    DocumentsListResponse
+)
 from app.schemas.auth import UserResponse
 from app.api.deps import require_auth
-from app.services.file_upload import file_upload_service
+from app.services.document_blobs import document_blob_store
+from app.services.file_upload import UploadStream, file_upload_service
+from app.services.storage import LocalStorage
+from app.services.thumbnails import thumbnail_service
 from app.utils.errors import AppException
+import os
 import uuid
 
 router = APIRouter()
 
+def _document_to_response(document: Document) -> DocumentResponse:
+    return DocumentResponse(
+        id=str(document.id),
+        entity=document.entity,
+        entity_id=str(document.entity_id),
+        label=document.label,
+        filename=document.filename,
+        content_type=document.content_type,
+        file_size=document.file_size,
+        file_path=document.r2_key,
+        public_url=document.public_url,
+        thumbnail_url=document.thumbnail_url,
+        uploaded_by=str(document.uploaded_by),
+        uploaded_by_name=document.uploaded_by_name,
+        created_at=document.created_at
+    )
+
+def _schedule_thumbnail(background_tasks: BackgroundTasks, document: Document) -> None:
+    # Rendered after the response is sent; DocumentResponse.thumbnail_url fills in later
+    if not document.thumbnail_url and thumbnail_service.supports(document):
+        background_tasks.add_task(thumbnail_service.generate, document.id)
+
 @router.get("/documents", response_model=DocumentsListResponse)
 async def list_documents(
     request: Request,
@@ -19,10 +55,10 @@ async def list_documents(
     entity_id: Optional[str] = Query(None, description="Filter by entity ID"),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserResponse = Depends(require_auth)
 ):
-    query = db.query(Document)
+    query = select(Document)
     
     # Apply filters
     if entity:
@@ -31,32 +67,14 @@ async def list_documents(
         query = query.filter(Document.entity_id == entity_id)
     
     # Count total
-    total = query.count()
+    total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
     
     # Apply pagination
     offset = (page - 1) * page_size
-    documents = query.offset(offset).limit(page_size).all()
-    
-    # Convert to response format
-    doc_responses = []
-    for doc in documents:
-        doc_responses.append(DocumentResponse(
-            id=str(doc.id),
-            entity=doc.entity,
-            entity_id=str(doc.entity_id),
-            label=doc.label,
-            filename=doc.filename,
-            content_type=doc.content_type,
-            file_size=doc.file_size,
-            file_path=doc.file_path,
-            public_url=doc.public_url,
-            uploaded_by=str(doc.uploaded_by),
-            uploaded_by_name=doc.uploaded_by_name,
-            created_at=doc.created_at
-        ))
+    documents = (await db.execute(query.offset(offset).limit(page_size))).scalars().all()
     
     return DocumentsListResponse(
-        data=doc_responses,
+        data=[_document_to_response(doc) for doc in documents],
         meta={
             "total": total,
             "page": page,
@@ -67,11 +85,12 @@ async def list_documents(
 
 @router.post("/upload", response_model=DocumentResponse)
 async def upload_document(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    entity: str = Form(...),
-    entity_id: str = Form(...),
+    entity: str = Form(..., max_length=64, pattern=KEY_SEGMENT_PATTERN),
+    entity_id: str = Form(..., max_length=64, pattern=KEY_SEGMENT_PATTERN),
     label: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserResponse = Depends(require_auth)
 ):
     # Validate file
@@ -82,21 +101,14 @@ async def upload_document(
             status_code=400
         )
     
-    # Check file size (10MB limit)
-    max_size = 10 * 1024 * 1024  # 10MB
-    file_content = await file.read()
-    if len(file_content) > max_size:
-        raise AppException(
-            code="FILE_TOO_LARGE",
-            message="File size exceeds 10MB limit",
-            status_code=400
-        )
-    
-    # Reset file position for upload service
-    await file.seek(0)
-    
-    # Upload file
-    file_url = await file_upload_service.upload_file(file, f"{entity}/{entity_id}")
+    # Reuses the stored file when identical content was uploaded before;
+    # aborts with FILE_TOO_LARGE as soon as the cap is passed
+    blob = await document_blob_store.store(
+        db,
+        file,
+        f"{entity}/{entity_id}",
+        max_size=settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    )
     
     # Save document record
     document = Document(
@@ -106,39 +118,193 @@ async def upload_document(
         label=label,
         filename=file.filename,
         content_type=file.content_type or "application/octet-stream",
-        file_size=len(file_content),
-        file_path=file_url,
-        public_url=file_url,
+        file_size=blob.size,
+        r2_key=blob.r2_key,
+        public_url=blob.public_url,
+        sha256=blob.sha256,
         uploaded_by=current_user.id,
         uploaded_by_name=current_user.name
     )
     
+    # Identical content may already have a thumbnail
+    existing_thumbnail = (await db.execute(
+        select(Document.thumbnail_key, Document.thumbnail_url)
+        .where(Document.sha256 == blob.sha256, Document.thumbnail_url.isnot(None))
+        .limit(1)
+    )).first()
+    if existing_thumbnail:
+        document.thumbnail_key, document.thumbnail_url = existing_thumbnail
+    
     db.add(document)
-    db.commit()
-    db.refresh(document)
+    await db.commit()
+    await db.refresh(document)
     
-    return DocumentResponse(
-        id=str(document.id),
-        entity=document.entity,
-        entity_id=str(document.entity_id),
-        label=document.label,
-        filename=document.filename,
-        content_type=document.content_type,
-        file_size=document.file_size,
-        file_path=document.file_path,
-        public_url=document.public_url,
-        uploaded_by=str(document.uploaded_by),
-        uploaded_by_name=document.uploaded_by_name,
-        created_at=document.created_at
+    _schedule_thumbnail(background_tasks, document)
+    return _document_to_response(document)
+
+@router.post("/documents/presign")
+async def presign_document_upload(
+    payload: DocumentPresignRequest,
+    current_user: UserResponse = Depends(require_auth)
+):
+    """Start a direct-to-storage upload; finish it with POST /documents/complete"""
+    max_size = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    if payload.file_size is not None and payload.file_size > max_size:
+        raise AppException(
+            code="FILE_TOO_LARGE",
+            message=f"File size exceeds {settings.MAX_UPLOAD_SIZE_MB}MB limit",
+            status_code=400
+        )
+    
+    file_extension = os.path.splitext(payload.filename)[1]
+    key = f"{payload.entity}/{payload.entity_id}/{uuid.uuid4()}{file_extension}"
+    expires_in = settings.PRESIGNED_UPLOAD_EXPIRE_SECONDS
+    target = await file_upload_service.storage.presign_upload(key, payload.content_type, expires_in)
+    
+    # Everything /complete needs, signed so the client cannot alter it; valid
+    # for twice the URL lifetime so slow uploads can still be completed
+    upload_token = create_signed_token(
+        {
+            "sub": str(current_user.id),
+            "entity": payload.entity,
+            "entity_id": payload.entity_id,
+            "filename": payload.filename,
+            "content_type": target["headers"]["Content-Type"],
+            "r2_key": target["r2_key"],
+            "public_url": target["public_url"]
+        },
+        "document-upload",
+        expires_in * 2
+    )
+    
+    return {
+        "ok": True,
+        "data": {
+            "upload_url": target["url"],
+            "method": target["method"],
+            "headers": target["headers"],
+            "upload_token": upload_token,
+            "expires_in": expires_in
+        }
+    }
+
+@router.post("/documents/complete", response_model=DocumentResponse)
+async def complete_document_upload(
+    payload: DocumentCompleteRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(require_auth)
+):
+    """Record a Document once its presigned upload is in storage"""
+    upload = read_signed_token(payload.upload_token, "document-upload")
+    if not upload or upload.get("sub") != str(current_user.id):
+        raise AppException(
+            code="INVALID_UPLOAD_TOKEN",
+            message="Upload token is invalid or expired",
+            status_code=400
+        )
+    
+    existing = (await db.execute(select(Document.id).where(Document.r2_key == upload["r2_key"]))).first()
+    if existing:
+        raise AppException(
+            code="UPLOAD_ALREADY_COMPLETED",
+            message="This upload has already been recorded",
+            status_code=409
+        )
+    
+    storage = file_upload_service.storage
+    size = await storage.size(upload["r2_key"])
+    if size is None:
+        raise AppException(
+            code="UPLOAD_NOT_FOUND",
+            message="Uploaded file not found in storage",
+            status_code=400
+        )
+    if size > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+        await storage.delete(upload["r2_key"])
+        raise AppException(
+            code="FILE_TOO_LARGE",
+            message=f"File size exceeds {settings.MAX_UPLOAD_SIZE_MB}MB limit",
+            status_code=400
+        )
+    
+    document = Document(
+        id=str(uuid.uuid4()),
+        entity=upload["entity"],
+        entity_id=upload["entity_id"],
+        label=payload.label,
+        filename=upload["filename"],
+        content_type=upload["content_type"],
+        file_size=size,
+        r2_key=upload["r2_key"],
+        public_url=upload["public_url"],
+        uploaded_by=current_user.id,
+        uploaded_by_name=current_user.name
+    )
+    
+    db.add(document)
+    await db.commit()
+    await db.refresh(document)
+    
+    _schedule_thumbnail(background_tasks, document)
+    return _document_to_response(document)
+
+# Signed stand-ins for bucket URLs when documents are stored on local disk.
+# Registered before /documents/{document_id} routes so "local" is not taken as an id.
+@router.put("/documents/local/upload")
+async def local_signed_upload(request: Request, token: str = Query(...)):
+    upload = read_signed_token(token, "local-upload")
+    if not upload or not isinstance(file_upload_service.storage, LocalStorage):
+        raise AppException(
+            code="INVALID_UPLOAD_TOKEN",
+            message="Upload URL is invalid or expired",
+            status_code=403
+        )
+    
+    stream = UploadStream(request.stream(), settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024)
+    await file_upload_service.storage.save(stream.chunks(), upload["key"], request.headers.get("content-type"))
+    return {"ok": True, "size": stream.size}
+
+@router.get("/documents/local/download")
+async def local_signed_download(token: str = Query(...)):
+    download = read_signed_token(token, "local-download")
+    if not download or not os.path.isfile(download["r2_key"]):
+        raise AppException(
+            code="INVALID_DOWNLOAD_URL",
+            message="Download URL is invalid or expired",
+            status_code=403
+        )
+    return FileResponse(download["r2_key"], filename=download.get("filename"))
+
+@router.get("/documents/{document_id}/download")
+async def download_document(
+    document_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(require_auth)
+):
+    """Redirect to a short-lived presigned URL for the document's file"""
+    document = await db.get(Document, document_id)
+    if not document:
+        raise AppException(
+            code="DOCUMENT_NOT_FOUND",
+            message="Document not found",
+            status_code=404
+        )
+    
+    url = await file_upload_service.storage.presign_download(
+        document.r2_key,
+        settings.PRESIGNED_DOWNLOAD_EXPIRE_SECONDS,
+        document.filename
     )
+    return RedirectResponse(url, status_code=307)
 
 @router.delete("/documents/{document_id}")
 async def delete_document(
     document_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserResponse = Depends(require_auth)
 ):
-    document = db.query(Document).filter(Document.id == document_id).first()
+    document = await db.get(Document, document_id)
     if not document:
         raise AppException(
             code="DOCUMENT_NOT_FOUND",
@@ -154,11 +320,16 @@ async def delete_document(
             status_code=403
         )
     
-    # Delete file from storage
-    file_upload_service.delete_file(document.file_path)
+    # Delete from database; a shared file loses one reference
+    await db.delete(document)
+    await db.flush()
+    orphaned_key = await document_blob_store.release(db, document.sha256) if document.sha256 else document.r2_key
+    await db.commit()
     
-    # Delete from database
-    db.delete(document)
-    db.commit()
+    # Delete file (and its thumbnail) from storage once nothing references it
+    if orphaned_key:
+        await file_upload_service.delete_file(orphaned_key)
+        if document.thumbnail_key:
+            await file_upload_service.delete_file(document.thumbnail_key)
     
     return {"ok": True, "message": "Document deleted successfully"}
\ No newline at end of file
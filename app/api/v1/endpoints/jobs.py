@@ -0,0 +1,124 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.api.deps import require_auth
+from app.models.employee import Employee
+from app.models.job import Job, JobStatus
+from app.schemas.job import JobResponse
+from app.services.file_upload import job_file_service
+from app.services.jobs import JOB_KINDS
+from app.utils.errors import AppException
+from app.utils.ids import generate_id
+import json
+
+router = APIRouter()
+
+async def _job_to_response(job: Job) -> JobResponse:
+    download_url = None
+    if job.status == JobStatus.SUCCEEDED and job.artifact_key:
+        download_url = await job_file_service.storage.presign_download(
+            job.artifact_key,
+            settings.PRESIGNED_DOWNLOAD_EXPIRE_SECONDS,
+            job.artifact_filename
+        )
+    return JobResponse(
+        id=str(job.id),
+        kind=job.kind,
+        status=job.status.value,
+        params=job.params,
+        progress=job.progress,
+        result=job.result,
+        error=job.error,
+        attempts=job.attempts,
+        download_url=download_url,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    kind: str = Form(...),
+    params: Optional[str] = Form(None, description="JSON object of job parameters"),
+    file: Optional[UploadFile] = File(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(require_auth)
+):
+    """Queue a long-running import or export; poll GET /jobs/{id} for its progress"""
+    job_kind = JOB_KINDS.get(kind)
+    if job_kind is None:
+        raise AppException(
+            code="INVALID_JOB",
+            message=f"Unknown job kind. Use one of: {', '.join(JOB_KINDS)}",
+            status_code=400
+        )
+
+    if job_kind.admin_only and current_user.role.value != "admin":
+        raise AppException(
+            code="PERMISSION_DENIED",
+            message="Admin access required",
+            status_code=status.HTTP_403_FORBIDDEN
+        )
+
+    try:
+        job_params = json.loads(params) if params else {}
+        if job_kind.params_model is not None:
+            job_params = job_kind.params_model(**job_params).model_dump(exclude_none=True)
+    except (ValueError, TypeError, ValidationError) as e:
+        raise AppException(
+            code="INVALID_PARAMS",
+            message=f"Invalid job parameters: {str(e)}",
+            status_code=400
+        )
+
+    job_id = generate_id()
+    input_key = None
+    if job_kind.needs_file:
+        if not file or not file.filename or not file.filename.endswith('.csv'):
+            raise AppException(
+                code="INVALID_FILE",
+                message="Please upload a CSV file",
+                status_code=400
+            )
+        stored = await job_file_service.upload_file(file, folder=f"jobs/{job_id}")
+        input_key = stored["r2_key"]
+
+    job = Job(
+        id=job_id,
+        kind=kind,
+        status=JobStatus.QUEUED,
+        params=job_params,
+        input_key=input_key,
+        attempts=0,
+        created_by=current_user.id
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    return {
+        "ok": True,
+        "message": "Job queued",
+        "data": await _job_to_response(job)
+    }
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(require_auth)
+):
+    """Status, progress and, once finished, the result or download URL of a job"""
+    job = await db.get(Job, job_id)
+    # Other users' jobs are reported as missing, not forbidden
+    if not job or (current_user.role.value != "admin" and str(job.created_by) != str(current_user.id)):
+        raise AppException(
+            code="JOB_NOT_FOUND",
+            message="Job not found",
+            status_code=404
+        )
+
+    return {"ok": True, "data": await _job_to_response(job)}
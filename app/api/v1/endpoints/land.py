@@ -1,9 +1,13 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.utils.pagination import apply_keyset_order, fetch_keyset_page
+from app.api.deps import get_current_user, require_auth
+from app.services.export_service import export_response, table_columns
 from app.models.user import User
+from app.models.employee import Employee
 from app.models.land import LandParcel
 from app.schemas.land import LandCreate, LandUpdate, LandResponse
 import uuid
@@ -13,8 +17,10 @@ router = APIRouter()
 
 @router.get("/", response_model=List[LandResponse])
 def read_land_parcels(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
     zone_filter: Optional[str] = Query(None, alias="zone"),
     city_filter: Optional[str] = Query(None, alias="city"),
     db: Session = Depends(get_db),
@@ -28,10 +34,34 @@ def read_land_parcels(
     if city_filter:
         query = query.filter(LandParcel.city.ilike(f"%{city_filter}%"))
     
-    land_parcels = query.offset(skip).limit(limit).all()
+    if cursor is None:
+        land_parcels = query.offset(skip).limit(limit).all()
+        return land_parcels
+    
+    # Keyset pagination, newest first; the next cursor is returned in a header
+    query = apply_keyset_order(query, LandParcel, "created_at", "desc")
+    land_parcels, next_cursor = fetch_keyset_page(query, LandParcel, "created_at", "desc", limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return land_parcels
 
 
+@router.get("/export")
+async def export_land_parcels(
+    request: Request,
+    zone_filter: Optional[str] = Query(None, alias="zone"),
+    city_filter: Optional[str] = Query(None, alias="city"),
+    format: str = Query("csv", regex="^(csv|parquet|arrow)$", description="Export format: csv|parquet|arrow"),
+    current_user: Employee = Depends(require_auth)
+):
+    statement = select(*table_columns(LandParcel)).order_by(LandParcel.created_at.desc())
+    if zone_filter:
+        statement = statement.where(LandParcel.zone == zone_filter)
+    if city_filter:
+        statement = statement.where(LandParcel.city.ilike(f"%{city_filter}%"))
+    return export_response(request, statement, "land_parcels", format)
+
+
 @router.post("/", response_model=LandResponse)
 def create_land_parcel(
     land_parcel: LandCreate,
@@ -1,22 +1,63 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from app.core.database import get_db
-from app.api.deps import get_current_user, require_admin
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.api.deps import get_current_user, require_admin, require_auth
 from app.models.employee import Employee
 from app.models.lead import Lead
-from app.models.pending_action import PendingAction
-from app.schemas.lead import LeadCreate, LeadUpdate, LeadResponse
-from app.schemas.pending_action import PendingActionCreate
+from app.schemas.lead import LeadCreate, LeadUpdate
 from app.utils.errors import AppException
+from app.utils.pagination import apply_keyset_order, count_total, fetch_keyset_page_async, page_meta
 from app.utils.ids import generate_id, generate_inquiry_no
-from app.services.csv_service import export_to_csv, import_from_csv
+from app.services.csv_service import open_csv_reader
 from app.services.approval_service import create_pending_action
+from app.services.employee_service import get_employee_names
+from app.services.export_service import EXPORT_FORMATS, export_response
+from app.services.lead_service import filter_leads, import_leads_csv, lead_export_statement
+import csv
 import json
 
 router = APIRouter()
 
+def _lead_to_dict(lead: Lead, employee_names: Dict[str, str]) -> Dict[str, Any]:
+    """Serialize a lead, taking owner/assignee names from a pre-resolved map"""
+    return {
+        "id": str(lead.id),
+        "inquiry_no": lead.inquiry_no,
+        "inquiry_date": lead.inquiry_date.isoformat() if lead.inquiry_date else None,
+        "client_company": lead.client_company,
+        "contact_person": lead.contact_person,
+        "contact_no": lead.contact_no,
+        "email": lead.email,
+        "designation": lead.designation,
+        "department": lead.department,
+        "type_of_space": lead.type_of_space.value if lead.type_of_space else None,
+        "space_requirement": lead.space_requirement,
+        "transaction_type": lead.transaction_type.value if lead.transaction_type else None,
+        "representative": lead.representative,
+        "budget": float(lead.budget) if lead.budget else None,
+        "city": lead.city,
+        "location_preference": lead.location_preference,
+        "description": lead.description,
+        "first_contact_date": lead.first_contact_date.isoformat() if lead.first_contact_date else None,
+        "last_contact_date": lead.last_contact_date.isoformat() if lead.last_contact_date else None,
+        "lead_managed_by": lead.lead_managed_by,
+        "action_date": lead.action_date.isoformat() if lead.action_date else None,
+        "status": lead.status.value if lead.status else None,
+        "next_action_plan": lead.next_action_plan,
+        "option_shared": lead.option_shared,
+        "remarks": lead.remarks,
+        "owner_id": str(lead.owner_id) if lead.owner_id else None,
+        "assignee_id": str(lead.assignee_id) if lead.assignee_id else None,
+        "owner_name": employee_names.get(str(lead.owner_id)) if lead.owner_id else None,
+        "assignee_name": employee_names.get(str(lead.assignee_id)) if lead.assignee_id else None,
+        "created_at": lead.created_at.isoformat(),
+        "updated_at": lead.updated_at.isoformat() if lead.updated_at else None
+    }
+
 @router.get("/")
 async def list_leads(
     request: Request,
@@ -28,121 +69,84 @@ async def list_leads(
     owner: str = Query("me", description="Filter by owner: me|all"),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
-    sort: Optional[str] = Query("created_at", description="Sort field"),
+    sort: Optional[str] = Query("created_at", description="Sort field, or 'relevance' together with q"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
-    format: Optional[str] = Query(None, description="Response format: json|csv"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
+    count: str = Query("exact", regex="^(exact|estimate|none)$", description="Total count mode: exact|estimate|none"),
+    format: Optional[str] = Query(None, description="Response format: json|csv|parquet|arrow"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
-    query = db.query(Lead)
-    
-    # Apply ownership filter for non-admin users
-    if current_user.role.value != "admin":
-        if owner == "all":
-            # Employees can only see their own or assigned leads
-            query = query.filter(
-                or_(
-                    Lead.owner_id == current_user.id,
-                    Lead.assignee_id == current_user.id
-                )
-            )
-        else:
-            query = query.filter(Lead.owner_id == current_user.id)
-    elif owner == "me":
-        query = query.filter(Lead.owner_id == current_user.id)
+    query, rank = filter_leads(
+        select(Lead), current_user, owner, q, city, type_of_space, transaction_type, status,
+        db.get_bind().dialect.name
+    )
     
-    # Apply filters
-    if q:
-        query = query.filter(
-            or_(
-                Lead.client_company.ilike(f"%{q}%"),
-                Lead.contact_person.ilike(f"%{q}%"),
-                Lead.email.ilike(f"%{q}%"),
-                Lead.inquiry_no.ilike(f"%{q}%")
-            )
-        )
-    if city:
-        query = query.filter(Lead.city.ilike(f"%{city}%"))
-    if type_of_space:
-        query = query.filter(Lead.type_of_space == type_of_space)
-    if transaction_type:
-        query = query.filter(Lead.transaction_type == transaction_type)
-    if status:
-        query = query.filter(Lead.status == status)
+    if format in EXPORT_FORMATS:
+        # Every matching lead, not just this page
+        return export_response(request, lead_export_statement(query), "leads", format)
     
-    # Count total
-    total = query.count()
+    # Count total (exact, planner estimate/cached, or skipped)
+    total, total_kind = await count_total(db, query, count)
     
-    # Apply sorting
-    if hasattr(Lead, sort):
-        order_column = getattr(Lead, sort)
-        if sort_order == "desc":
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    if sort == "relevance" and rank is not None:
+        # Relevance depends on q, so it can only be paged by offset
+        if cursor is not None:
+            raise AppException(
+                code="INVALID_CURSOR",
+                message="Cursor pagination is not supported when sorting by relevance",
+                status_code=400
+            )
+        query = query.order_by(rank.desc(), Lead.id.desc())
+        leads = (await db.execute(query.offset((page - 1) * page_size).limit(page_size))).scalars().all()
+        next_cursor = None
+    else:
+        # Apply sorting (id breaks ties so cursors are stable)
+        query = apply_keyset_order(query, Lead, sort, sort_order)
+        
+        # Apply pagination: keyset when a cursor is given, offset otherwise
+        if cursor is None:
+            query = query.offset((page - 1) * page_size)
+        leads, next_cursor = await fetch_keyset_page_async(db, query, Lead, sort, sort_order, page_size, cursor)
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    leads = query.offset(offset).limit(page_size).all()
+    # Resolve owner/assignee names for the whole page in one query
+    employee_names = await get_employee_names(
+        db, [lead.owner_id for lead in leads] + [lead.assignee_id for lead in leads]
+    )
     
     # Convert to response format
-    lead_responses = []
-    for lead in leads:
-        owner = db.query(Employee).filter(Employee.id == lead.owner_id).first()
-        assignee = db.query(Employee).filter(Employee.id == lead.assignee_id).first()
-        
-        lead_responses.append({
-            "id": str(lead.id),
-            "inquiry_no": lead.inquiry_no,
-            "inquiry_date": lead.inquiry_date.isoformat() if lead.inquiry_date else None,
-            "client_company": lead.client_company,
-            "contact_person": lead.contact_person,
-            "contact_no": lead.contact_no,
-            "email": lead.email,
-            "designation": lead.designation,
-            "department": lead.department,
-            "type_of_space": lead.type_of_space.value if lead.type_of_space else None,
-            "space_requirement": lead.space_requirement,
-            "transaction_type": lead.transaction_type.value if lead.transaction_type else None,
-            "representative": lead.representative,
-            "budget": float(lead.budget) if lead.budget else None,
-            "city": lead.city,
-            "location_preference": lead.location_preference,
-            "description": lead.description,
-            "first_contact_date": lead.first_contact_date.isoformat() if lead.first_contact_date else None,
-            "last_contact_date": lead.last_contact_date.isoformat() if lead.last_contact_date else None,
-            "lead_managed_by": lead.lead_managed_by,
-            "action_date": lead.action_date.isoformat() if lead.action_date else None,
-            "status": lead.status.value if lead.status else None,
-            "next_action_plan": lead.next_action_plan,
-            "option_shared": lead.option_shared,
-            "remarks": lead.remarks,
-            "owner_id": str(lead.owner_id) if lead.owner_id else None,
-            "assignee_id": str(lead.assignee_id) if lead.assignee_id else None,
-            "owner_name": owner.name if owner else None,
-            "assignee_name": assignee.name if assignee else None,
-            "created_at": lead.created_at.isoformat(),
-            "updated_at": lead.updated_at.isoformat() if lead.updated_at else None
-        })
-    
-    if format == "csv":
-        return export_to_csv(lead_responses, "leads")
+    lead_responses = [_lead_to_dict(lead, employee_names) for lead in leads]
     
     return {
         "ok": True,
         "data": lead_responses,
-        "meta": {
-            "total": total,
-            "page": page,
-            "page_size": page_size,
-            "total_pages": (total + page_size - 1) // page_size
-        }
+        "meta": page_meta(total, page, page_size, cursor, next_cursor, total_kind)
     }
 
+
+@router.get("/export")
+async def export_leads(
+    request: Request,
+    q: Optional[str] = Query(None, description="Search query"),
+    city: Optional[str] = Query(None, description="Filter by city"),
+    type_of_space: Optional[str] = Query(None, description="Filter by type of space"),
+    transaction_type: Optional[str] = Query(None, description="Filter by transaction type"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    owner: str = Query("me", description="Filter by owner: me|all"),
+    format: str = Query("csv", regex="^(csv|parquet|arrow)$", description="Export format: csv|parquet|arrow"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(require_auth)
+):
+    query, _ = filter_leads(
+        select(Lead), current_user, owner, q, city, type_of_space, transaction_type, status,
+        db.get_bind().dialect.name
+    )
+    return export_response(request, lead_export_statement(query), "leads", format)
+
 @router.post("/")
 async def create_lead(
     lead_data: LeadCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
     if current_user.role.value != "admin":
@@ -164,7 +168,7 @@ async def create_lead(
     # Admin can create directly
     # Check if inquiry number already exists
     if lead_data.inquiry_no:
-        existing_lead = db.query(Lead).filter(Lead.inquiry_no == lead_data.inquiry_no).first()
+        existing_lead = (await db.execute(select(Lead).where(Lead.inquiry_no == lead_data.inquiry_no))).scalar_one_or_none()
         if existing_lead:
             raise AppException(
                 code="INQUIRY_NO_EXISTS",
@@ -180,8 +184,8 @@ async def create_lead(
     )
     
     db.add(db_lead)
-    db.commit()
-    db.refresh(db_lead)
+    await db.commit()
+    await db.refresh(db_lead)
     
     return {
         "ok": True,
@@ -197,10 +201,10 @@ async def create_lead(
 @router.get("/{lead_id}")
 async def get_lead(
     lead_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = await db.get(Lead, lead_id)
     if not lead:
         raise AppException(
             code="LEAD_NOT_FOUND",
@@ -217,54 +221,21 @@ async def get_lead(
                 status_code=403
             )
     
-    owner = db.query(Employee).filter(Employee.id == lead.owner_id).first()
-    assignee = db.query(Employee).filter(Employee.id == lead.assignee_id).first()
+    employee_names = await get_employee_names(db, [lead.owner_id, lead.assignee_id])
     
     return {
         "ok": True,
-        "data": {
-            "id": str(lead.id),
-            "inquiry_no": lead.inquiry_no,
-            "inquiry_date": lead.inquiry_date.isoformat() if lead.inquiry_date else None,
-            "client_company": lead.client_company,
-            "contact_person": lead.contact_person,
-            "contact_no": lead.contact_no,
-            "email": lead.email,
-            "designation": lead.designation,
-            "department": lead.department,
-            "type_of_space": lead.type_of_space.value if lead.type_of_space else None,
-            "space_requirement": lead.space_requirement,
-            "transaction_type": lead.transaction_type.value if lead.transaction_type else None,
-            "representative": lead.representative,
-            "budget": float(lead.budget) if lead.budget else None,
-            "city": lead.city,
-            "location_preference": lead.location_preference,
-            "description": lead.description,
-            "first_contact_date": lead.first_contact_date.isoformat() if lead.first_contact_date else None,
-            "last_contact_date": lead.last_contact_date.isoformat() if lead.last_contact_date else None,
-            "lead_managed_by": lead.lead_managed_by,
-            "action_date": lead.action_date.isoformat() if lead.action_date else None,
-            "status": lead.status.value if lead.status else None,
-            "next_action_plan": lead.next_action_plan,
-            "option_shared": lead.option_shared,
-            "remarks": lead.remarks,
-            "owner_id": str(lead.owner_id) if lead.owner_id else None,
-            "assignee_id": str(lead.assignee_id) if lead.assignee_id else None,
-            "owner_name": owner.name if owner else None,
-            "assignee_name": assignee.name if assignee else None,
-            "created_at": lead.created_at.isoformat(),
-            "updated_at": lead.updated_at.isoformat() if lead.updated_at else None
-        }
+        "data": _lead_to_dict(lead, employee_names)
     }
 
 @router.patch("/{lead_id}")
 async def update_lead(
     lead_id: str,
     lead_update: LeadUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = await db.get(Lead, lead_id)
     if not lead:
         raise AppException(
             code="LEAD_NOT_FOUND",
@@ -302,18 +273,18 @@ async def update_lead(
     for field, value in update_data.items():
         setattr(lead, field, value)
     
-    db.commit()
-    db.refresh(lead)
+    await db.commit()
+    await db.refresh(lead)
     
     return {"ok": True, "message": "Lead updated successfully"}
 
 @router.delete("/{lead_id}")
 async def delete_lead(
     lead_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    lead = await db.get(Lead, lead_id)
     if not lead:
         raise AppException(
             code="LEAD_NOT_FOUND",
@@ -347,15 +318,16 @@ async def delete_lead(
         )
     
     # Admin can delete directly
-    db.delete(lead)
-    db.commit()
+    await db.delete(lead)
+    await db.commit()
     
     return {"ok": True, "message": "Lead deleted successfully"}
 
 @router.post("/import")
 async def import_leads(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    stream: bool = Query(False, description="Stream NDJSON progress events while importing"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(require_admin)
 ):
     if not file.filename or not file.filename.endswith('.csv'):
@@ -365,34 +337,37 @@ async def import_leads(
             status_code=400
         )
     
-    content = await file.read()
-    csv_data = content.decode('utf-8')
+    # Decoded incrementally from the spooled upload, never read into memory whole
+    try:
+        reader = await run_in_threadpool(open_csv_reader, file.file)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        raise AppException(
+            code="INVALID_FILE",
+            message=f"Failed to parse CSV: {str(e)}",
+            status_code=400
+        )
     
-    result = import_from_csv(csv_data, LeadCreate)
+    owner_id = current_user.id
     
-    # Create leads from valid rows
-    created_count = 0
-    for row_data in result["valid_rows"]:
-        try:
-            db_lead = Lead(
-                id=generate_id(),
-                inquiry_no=row_data.get("inquiry_no") or generate_inquiry_no(),
-                owner_id=current_user.id,
-                **row_data
-            )
-            db.add(db_lead)
-            created_count += 1
-        except Exception as e:
-            result["errors"].append(f"Failed to create lead: {str(e)}")
+    if stream:
+        async def progress_lines():
+            # Own session: the response outlives the request's dependencies
+            async with AsyncSessionLocal() as session:
+                async for event in import_leads_csv(session, reader, owner_id):
+                    yield json.dumps(event) + "\n"
+        
+        return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
     
-    db.commit()
+    async for summary in import_leads_csv(db, reader, owner_id):
+        pass
     
     return {
         "ok": True,
-        "message": f"Import completed. {created_count} leads created.",
+        "message": f"Import completed. {summary['created']} leads created.",
         "details": {
-            "created": created_count,
-            "errors": result["errors"],
-            "total_rows": result["total_rows"]
+            "created": summary["created"],
+            "errors": summary["errors"],
+            "error_count": summary["error_count"],
+            "total_rows": summary["processed"]
         }
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from app.core.config import settings
+from app.core.database import async_engine, engine
+from app.core.db_pool import pool_status
+from app.core.password_pool import password_pool
+from app.api.deps import require_admin
+from app.models.employee import Employee
+
+router = APIRouter()
+
+@router.get("/db-pool")
+async def get_db_pool_metrics(
+    current_user: Employee = Depends(require_admin)
+):
+    """Live checkout, overflow and wait-time stats for both connection pools"""
+    return {
+        "ok": True,
+        "data": {
+            "sync": pool_status(engine.pool),
+            "async": pool_status(async_engine.pool)
+        },
+        "meta": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS
+        }
+    }
+
+@router.get("/password-pool")
+async def get_password_pool_metrics(
+    current_user: Employee = Depends(require_admin)
+):
+    """Queue depth and timings of the bcrypt hash/verify pool"""
+    return {
+        "ok": True,
+        "data": password_pool.snapshot()
+    }
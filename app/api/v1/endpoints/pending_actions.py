@@ -1,18 +1,41 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.api.deps import get_current_user, require_admin
 from app.models.pending_action import PendingAction
 from app.models.employee import Employee
 from app.schemas.pending_action import PendingActionResponse, PendingActionUpdate
 from app.utils.errors import AppException
+from app.utils.pagination import apply_keyset_order, count_total, fetch_keyset_page_async, page_meta
 from app.services.approval_service import apply_pending_action
+from app.services.employee_service import get_employee_names
 from datetime import datetime
 import json
 
 router = APIRouter()
 
+def _action_to_dict(action: PendingAction, employee_names: Dict[str, str]) -> Dict[str, Any]:
+    """Serialize a pending action, taking requester/reviewer names from a pre-resolved map"""
+    return {
+        "id": str(action.id),
+        "module": action.module,
+        "action_type": action.action_type.value,
+        "target_id": str(action.target_id) if action.target_id else None,
+        "payload": json.loads(action.payload) if action.payload else {},
+        "requested_by": str(action.requested_by),
+        "requested_by_name": employee_names.get(str(action.requested_by)),
+        "requested_at": action.requested_at.isoformat(),
+        "status": action.status.value,
+        "reviewed_by": str(action.reviewed_by) if action.reviewed_by else None,
+        "reviewed_by_name": employee_names.get(str(action.reviewed_by)) if action.reviewed_by else None,
+        "reviewed_at": action.reviewed_at.isoformat() if action.reviewed_at else None,
+        "note": action.note,
+        "created_at": action.created_at.isoformat(),
+        "updated_at": action.updated_at.isoformat() if action.updated_at else None
+    }
+
 @router.get("/")
 async def list_pending_actions(
     request: Request,
@@ -24,10 +47,12 @@ async def list_pending_actions(
     page_size: int = Query(50, ge=1, le=100),
     sort: Optional[str] = Query("created_at", description="Sort field"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
+    count: str = Query("exact", regex="^(exact|estimate|none)$", description="Total count mode: exact|estimate|none"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(get_current_user)
 ):
-    query = db.query(PendingAction)
+    query = select(PendingAction)
     
     # Non-admin users can only see their own requests
     if current_user.role.value != "admin":
@@ -43,64 +68,39 @@ async def list_pending_actions(
     if action_type:
         query = query.filter(PendingAction.action_type == action_type)
     
-    # Count total
-    total = query.count()
+    # Count total (exact, planner estimate/cached, or skipped)
+    total, total_kind = await count_total(db, query, count)
     
-    # Apply sorting
-    if hasattr(PendingAction, sort):
-        order_column = getattr(PendingAction, sort)
-        if sort_order == "desc":
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    # Apply sorting (id breaks ties so cursors are stable)
+    query = apply_keyset_order(query, PendingAction, sort, sort_order)
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    actions = query.offset(offset).limit(page_size).all()
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    if cursor is None:
+        query = query.offset((page - 1) * page_size)
+    actions, next_cursor = await fetch_keyset_page_async(db, query, PendingAction, sort, sort_order, page_size, cursor)
+    
+    # Resolve requester/reviewer names for the whole page in one query
+    employee_names = await get_employee_names(
+        db, [action.requested_by for action in actions] + [action.reviewed_by for action in actions]
+    )
     
     # Convert to response format
-    action_responses = []
-    for action in actions:
-        requester = db.query(Employee).filter(Employee.id == action.requested_by).first()
-        reviewer = db.query(Employee).filter(Employee.id == action.reviewed_by).first()
-        
-        action_responses.append({
-            "id": str(action.id),
-            "module": action.module,
-            "action_type": action.action_type.value,
-            "target_id": str(action.target_id) if action.target_id else None,
-            "payload": json.loads(action.payload) if action.payload else {},
-            "requested_by": str(action.requested_by),
-            "requested_by_name": requester.name if requester else None,
-            "requested_at": action.requested_at.isoformat(),
-            "status": action.status.value,
-            "reviewed_by": str(action.reviewed_by) if action.reviewed_by else None,
-            "reviewed_by_name": reviewer.name if reviewer else None,
-            "reviewed_at": action.reviewed_at.isoformat() if action.reviewed_at else None,
-            "note": action.note,
-            "created_at": action.created_at.isoformat(),
-            "updated_at": action.updated_at.isoformat() if action.updated_at else None
-        })
+    action_responses = [_action_to_dict(action, employee_names) for action in actions]
     
     return {
         "ok": True,
         "data": action_responses,
-        "meta": {
-            "total": total,
-            "page": page,
-            "page_size": page_size,
-            "total_pages": (total + page_size - 1) // page_size
-        }
+        "meta": page_meta(total, page, page_size, cursor, next_cursor, total_kind)
     }
 
 @router.post("/{action_id}/approve")
 async def approve_pending_action(
     action_id: str,
     admin_notes: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(require_admin)
 ):
-    action = db.query(PendingAction).filter(PendingAction.id == action_id).first()
+    action = await db.get(PendingAction, action_id)
     if not action:
         raise AppException(
             code="ACTION_NOT_FOUND",
@@ -125,12 +125,12 @@ async def approve_pending_action(
         action.reviewed_by = current_user.id
         action.reviewed_at = datetime.utcnow()
         
-        db.commit()
+        await db.commit()
         
         return {"ok": True, "message": "Action approved and applied successfully"}
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise AppException(
             code="APPROVAL_FAILED",
             message=f"Failed to apply action: {str(e)}",
@@ -141,10 +141,10 @@ async def approve_pending_action(
 async def reject_pending_action(
     action_id: str,
     action_update: PendingActionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Employee = Depends(require_admin)
 ):
-    action = db.query(PendingAction).filter(PendingAction.id == action_id).first()
+    action = await db.get(PendingAction, action_id)
     if not action:
         raise AppException(
             code="ACTION_NOT_FOUND",
@@ -165,6 +165,6 @@ async def reject_pending_action(
     action.reviewed_by = current_user.id
     action.reviewed_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {"ok": True, "message": "Action rejected successfully"}
\ No newline at end of file
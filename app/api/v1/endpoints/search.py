@@ -0,0 +1,41 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.api.deps import require_auth
+from app.models.employee import Employee
+from app.services.search_service import SEARCH_ENTITY_TYPES, search_all
+from app.utils.errors import AppException
+
+router = APIRouter()
+
+@router.get("/")
+def global_search(
+    q: str = Query(..., min_length=2, description="Search query"),
+    types: Optional[str] = Query(None, description="Comma-separated entity types to search"),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(require_auth)
+):
+    entity_types = None
+    if types:
+        entity_types = [t.strip() for t in types.split(",") if t.strip()]
+        unknown = sorted(set(entity_types) - set(SEARCH_ENTITY_TYPES))
+        if unknown:
+            raise AppException(
+                code="INVALID_SEARCH_TYPE",
+                message=f"Unknown search type(s): {', '.join(unknown)}",
+                status_code=400,
+                details={"allowed": list(SEARCH_ENTITY_TYPES)}
+            )
+    
+    hits = search_all(db, q.strip(), current_user, entity_types, limit)
+    
+    return {
+        "ok": True,
+        "data": hits,
+        "meta": {
+            "q": q,
+            "count": len(hits)
+        }
+    }
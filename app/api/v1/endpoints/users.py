@@ -2,8 +2,9 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.password_pool import password_pool
 from app.core.security import get_password_hash
-from app.api.deps import get_current_user, get_admin_user
+from app.api.deps import get_current_user, require_admin
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
 import uuid
@@ -16,7 +17,7 @@ def read_users(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+    current_user: User = Depends(require_admin)
 ):
     users = db.query(User).offset(skip).limit(limit).all()
     return users
@@ -26,7 +27,7 @@ def read_users(
 def create_user(
     user: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+    current_user: User = Depends(require_admin)
 ):
     # Check if user already exists
     db_user = db.query(User).filter(User.email == user.email).first()
@@ -43,7 +44,7 @@ def create_user(
             detail="Username already taken"
         )
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = password_pool.run_sync(get_password_hash, user.password)
     db_user = User(
         id=str(uuid.uuid4()),
         name=user.name,
@@ -107,7 +108,7 @@ def update_user(
     
     # Hash password if provided
     if "password" in update_data:
-        update_data["password"] = get_password_hash(update_data["password"])
+        update_data["password"] = password_pool.run_sync(get_password_hash, update_data["password"])
     
     for field, value in update_data.items():
         setattr(user, field, value)
@@ -121,7 +122,7 @@ def update_user(
 def delete_user(
     user_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+    current_user: User = Depends(require_admin)
 ):
     if current_user.id == user_id:
         raise HTTPException(
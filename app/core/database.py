@@ -1,17 +1,76 @@
+from typing import Any, Dict
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.db_pool import TimedAsyncQueuePool, TimedQueuePool
+
+# Async driver for each sync URL scheme we support
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    """Return ASYNC_DATABASE_URL, or DATABASE_URL rewritten for its async driver"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    scheme, sep, rest = settings.DATABASE_URL.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def _engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """Pool sizing and per-connection settings shared by both engines"""
+    options: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+        "echo": settings.DEBUG
+    }
+    if url.startswith("sqlite"):
+        return options
+
+    options.update(
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+
+    connect_args: Dict[str, Any] = {}
+    if is_async:
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        connect_args["prepared_statement_cache_size"] = settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        if not settings.DB_PREPARED_STATEMENT_CACHE_SIZE:
+            # asyncpg's own statement cache also prepares server-side
+            connect_args["statement_cache_size"] = 0
+    elif settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    options["connect_args"] = connect_args
+    return options
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.debug
-)
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    get_async_database_url(),
+    **_engine_options(get_async_database_url(), is_async=True)
+)
+
+# expire_on_commit=False: attribute refreshes after commit would need implicit IO
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -20,4 +79,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
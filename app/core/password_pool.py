@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+from fastapi import status
+from app.core.config import settings
+from app.utils.errors import AppException
+
+T = TypeVar("T")
+
+class PasswordPool:
+    """Fixed-size thread pool for bcrypt, so hashing never blocks the event loop
+
+    bcrypt releases the GIL, so the workers hash in parallel. Work beyond
+    max_queue waiting jobs is rejected with 503 instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="password"
+                    )
+        return self._executor
+
+    def _admit(self) -> float:
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise AppException(
+                    code="SERVER_BUSY",
+                    message="Too many concurrent sign-ins, please retry shortly",
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            self.queued += 1
+        return time.perf_counter()
+
+    def _tracked(self, submitted: float, fn: Callable[..., T], *args: Any) -> T:
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_total += started - submitted
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.run_total += elapsed
+                self.run_max = max(self.run_max, elapsed)
+
+    def _forget_if_cancelled(self, future: Future) -> None:
+        # A future cancelled while still waiting never reaches _tracked, which would un-queue it
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        submitted = self._admit()
+        future = self.executor.submit(self._tracked, submitted, fn, *args)
+        future.add_done_callback(self._forget_if_cancelled)
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn on the pool from async code; cancelling the caller cancels a job not yet started"""
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def run_sync(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn on the pool from sync code, sharing its concurrency bound"""
+        return self._submit(fn, *args).result()
+
+    def map_sync(self, fn: Callable[[Any], T], items: Iterable[Any]) -> List[T]:
+        """Run fn over items in parallel on the pool, preserving order"""
+        futures = [self._submit(fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_avg_ms": round(self.wait_total / self.completed * 1000, 3) if self.completed else 0.0,
+                "run_avg_ms": round(self.run_total / self.completed * 1000, 3) if self.completed else 0.0,
+                "run_max_ms": round(self.run_max * 1000, 3)
+            }
+
+password_pool = PasswordPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
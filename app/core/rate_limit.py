@@ -0,0 +1,172 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.security import get_token_from_request, verify_token
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKENDS = ("memory", "postgres")
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds until the next request would be allowed
+
+class RateLimiter:
+    """Rate-limit backend interface: count one hit for key against limit per window"""
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        raise NotImplementedError
+
+class MemoryRateLimiter(RateLimiter):
+    """Per-process token buckets, bounded to max_keys
+
+    Only buckets that have refilled are evicted, since dropping one is the
+    same as the client starting over. When every tracked client is still
+    active, new clients go untracked (allowed) until a bucket refills.
+    Limits are per worker: with N workers a client may get up to N x limit.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> (tokens, updated, full_at), least recently hit first
+        self._buckets: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _make_room(self, now: float) -> bool:
+        # Least recently hit first; a bucket untouched for a whole window is always full
+        while self._buckets:
+            key, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at > now:
+                break
+            del self._buckets[key]
+        return len(self._buckets) < self.max_keys
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        now = time.monotonic()
+        rate = limit / window_seconds
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens, tracked = float(limit), self._make_room(now)
+            else:
+                tokens = min(float(limit), bucket[0] + (now - bucket[1]) * rate)
+                tracked = True
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if tracked:
+                self._buckets[key] = (tokens, now, now + (limit - tokens) / rate)
+                self._buckets.move_to_end(key)
+            else:
+                logger.warning("Rate limit table full, request not counted", extra={"max_keys": self.max_keys})
+        retry_after = 0.0 if allowed else (1 - tokens) / rate
+        return RateLimitResult(allowed, int(tokens), retry_after)
+
+class PostgresRateLimiter(RateLimiter):
+    """Fixed-window counters in the rate_limits table, shared by every worker
+
+    Fails open: while the database is unreachable every request is allowed.
+    """
+
+    def __init__(self):
+        self._next_cleanup = 0.0
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        now = time.time()
+        window_start = int(now // window_seconds) * window_seconds
+        try:
+            async with async_engine.begin() as conn:
+                hits = (await conn.execute(
+                    text(
+                        "INSERT INTO rate_limits (key, window_start, hits) VALUES (:key, :window_start, 1) "
+                        "ON CONFLICT (key, window_start) DO UPDATE SET hits = rate_limits.hits + 1 "
+                        "RETURNING hits"
+                    ),
+                    {"key": key, "window_start": window_start}
+                )).scalar_one()
+                if now >= self._next_cleanup:
+                    self._next_cleanup = now + window_seconds
+                    await conn.execute(
+                        text("DELETE FROM rate_limits WHERE window_start < :cutoff"),
+                        {"cutoff": window_start - window_seconds}
+                    )
+        except Exception:
+            # Fail open: a limiter outage must not take the API down with it
+            logger.warning("Rate limit backend unavailable", exc_info=True)
+            return RateLimitResult(True, limit, 0.0)
+
+        allowed = hits <= limit
+        retry_after = 0.0 if allowed else window_start + window_seconds - now
+        return RateLimitResult(allowed, max(limit - hits, 0), retry_after)
+
+def _build_rate_limiter() -> RateLimiter:
+    if settings.RATE_LIMIT_BACKEND not in RATE_LIMIT_BACKENDS:
+        raise ValueError(f"RATE_LIMIT_BACKEND must be one of {', '.join(RATE_LIMIT_BACKENDS)}")
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        return PostgresRateLimiter()
+    return MemoryRateLimiter(settings.RATE_LIMIT_MAX_KEYS)
+
+rate_limiter = _build_rate_limiter()
+
+def _rate_limited_response(retry_after: float, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={
+            "ok": False,
+            "error": {
+                "code": "RATE_LIMITED",
+                "message": message,
+                "details": {}
+            }
+        },
+        headers={"Retry-After": str(math.ceil(retry_after))}
+    )
+
+class RateLimitMiddleware:
+    """Enforce RATE_LIMIT_API per minute per user (per client IP when anonymous)
+
+    Plain ASGI rather than BaseHTTPMiddleware, so allowed requests pass
+    straight through without an extra task or buffered response body.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or settings.RATE_LIMIT_API <= 0 or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        token = get_token_from_request(request)
+        payload = verify_token(token) if token else None
+        if payload and payload.get("sub"):
+            key = f"api:user:{payload['sub']}"
+        else:
+            key = f"api:ip:{request.client.host if request.client else 'unknown'}"
+
+        result = await rate_limiter.hit(key, settings.RATE_LIMIT_API, 60)
+        if not result.allowed:
+            response = _rate_limited_response(result.retry_after, "Too many requests. Please slow down.")
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(settings.RATE_LIMIT_API)
+                headers["X-RateLimit-Remaining"] = str(result.remaining)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
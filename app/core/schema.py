@@ -0,0 +1,66 @@
+import logging
+from pathlib import Path
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401  registers every table on Base.metadata
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_MODES = ("auto", "create", "check", "skip")
+
+_MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "supabase" / "migrations"
+
+# Where the Supabase CLI records applied migrations
+MIGRATION_LEDGER = "supabase_migrations.schema_migrations"
+
+
+def resolve_schema_mode() -> str:
+    """Turn DB_SCHEMA_MODE=auto into create (SQLite) or check"""
+    mode = settings.DB_SCHEMA_MODE
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f"DB_SCHEMA_MODE must be one of {', '.join(SCHEMA_MODES)}, got {mode!r}")
+    if mode == "auto":
+        return "create" if settings.DATABASE_URL.startswith("sqlite") else "check"
+    return mode
+
+
+def expected_migrations() -> List[str]:
+    """Versions of the SQL migrations shipped with this code, oldest first"""
+    return sorted(path.name.split("_", 1)[0] for path in _MIGRATIONS_DIR.glob("*.sql"))
+
+
+async def prepare_schema(engine: AsyncEngine) -> None:
+    """Create tables (SQLite) or verify every shipped migration has been applied"""
+    mode = resolve_schema_mode()
+    if mode == "skip":
+        return
+
+    if mode == "create":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return
+
+    expected = expected_migrations()
+    if not expected:
+        raise RuntimeError(f"No migrations found in {_MIGRATIONS_DIR}; cannot check the database schema")
+
+    async with engine.connect() as conn:
+        try:
+            applied = set((await conn.execute(text(f"SELECT version FROM {MIGRATION_LEDGER}"))).scalars())
+        except DBAPIError as e:
+            raise RuntimeError(
+                f"Migration ledger {MIGRATION_LEDGER} not found; apply supabase/migrations "
+                "('supabase db push') before starting the API"
+            ) from e
+
+    missing = [version for version in expected if version not in applied]
+    if missing:
+        raise RuntimeError(
+            f"Database is missing migration(s) {', '.join(missing)}; apply supabase/migrations "
+            "('supabase db push') before starting the API"
+        )
+    logger.info("Database schema at migration %s", expected[-1])
@@ -1,11 +1,19 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Request, Response
 from app.core.config import settings
+from app.core.password_pool import password_pool
+from app.utils.cache import ExpiringLRU
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# jose and passlib are imported on first use to keep worker startup fast
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -21,15 +29,35 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         "aud": "real-estate-crm"
     })
     
+    from jose import jwt
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded password pool, off the event loop"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bounded password pool, off the event loop"""
+    return await password_pool.run(get_password_hash, password)
+
+# Verified payloads keyed by token hash, each kept until the token's exp
+_verified_tokens = ExpiringLRU(settings.TOKEN_CACHE_MAX_ENTRIES)
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(key)
+    if payload is not None:
+        # A copy per caller, so no request can change what later ones see
+        return dict(payload)
+    
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token, 
@@ -38,7 +66,25 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
             audience="real-estate-crm",
             issuer="real-estate-crm"
         )
-        return payload
+    except JWTError:
+        return None
+    
+    if "exp" in payload:
+        _verified_tokens.put(key, dict(payload), payload["exp"] - time.time())
+    return payload
+
+def create_signed_token(data: Dict[str, Any], purpose: str, expires_in: int) -> str:
+    """Sign data into a short-lived token only valid for the given purpose"""
+    from jose import jwt
+    to_encode = {**data, "exp": int(time.time()) + expires_in, "aud": purpose}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+def read_signed_token(token: str, purpose: str) -> Optional[Dict[str, Any]]:
+    """Return the data in a token from create_signed_token, or None if invalid/expired"""
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], audience=purpose)
     except JWTError:
         return None
 
@@ -62,27 +108,3 @@ def clear_auth_cookie(response: Response) -> None:
 
 def get_token_from_request(request: Request) -> Optional[str]:
     return request.cookies.get("auth_token")
-
-# Rate limiting (simple in-memory)
-_rate_limits: Dict[str, Dict[str, Any]] = {}
-
-def check_rate_limit(key: str, limit: int, window_minutes: int = 1) -> bool:
-    now = datetime.utcnow()
-    window_start = now - timedelta(minutes=window_minutes)
-    
-    if key not in _rate_limits:
-        _rate_limits[key] = {"count": 0, "window_start": now}
-        return True
-    
-    rate_data = _rate_limits[key]
-    
-    # Reset window if expired
-    if rate_data["window_start"] < window_start:
-        rate_data["count"] = 0
-        rate_data["window_start"] = now
-    
-    if rate_data["count"] >= limit:
-        return False
-    
-    rate_data["count"] += 1
-    return True
\ No newline at end of file
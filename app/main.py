@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -7,30 +8,44 @@ import time
 import uuid
 import os
 from app.core.config import settings
-from app.api.v1.api import api_router
-from app.core.database import engine
-from app.models import Base
+from app.api.v1.api import LazyAPIApp
+from app.core.database import async_engine
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.schema import prepare_schema
+from app.services.bulk_import import validation_pool
+from app.services.thumbnails import thumbnail_service
 from app.utils.logging import setup_logging, logger
 from app.utils.errors import AppException
 
 # Setup logging
 setup_logging()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema creation/verification per DB_SCHEMA_MODE, once per worker
+    await prepare_schema(async_engine)
+    yield
+    thumbnail_service.pool.shutdown()
+    validation_pool.shutdown()
+    await async_engine.dispose()
 
-app = FastAPI(
+# The /api/v1 routes are registered on startup or first request, keeping imports cheap
+app = LazyAPIApp(
     title="Real Estate CRM API",
     description="Production-ready CRM with RBAC and approval workflow",
     version="1.0.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    lifespan=lifespan,
 )
 
 # Security middleware
 if not settings.DEBUG:
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
 
+# Per-user API rate limit (registered before CORS so 429s still carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -38,10 +53,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Mount static files for local file uploads (fallback if not using S3/Supabase)
-if not settings.aws_access_key_id and not settings.supabase_url:
+if not settings.AWS_ACCESS_KEY_ID and not settings.SUPABASE_URL:
     os.makedirs("uploads", exist_ok=True)
     app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -86,9 +102,6 @@ async def app_exception_handler(request: Request, exc: AppException):
         }
     )
 
-# Include API routes
-app.include_router(api_router, prefix="/api/v1")
-
 @app.get("/")
 async def root():
     return {
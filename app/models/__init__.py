@@ -1,4 +1,5 @@
 from .user import User
+from .employee import Employee
 from .lead import Lead
 from .developer import Developer
 from .contact import Contact
@@ -6,10 +7,15 @@ from .project import ProjectMaster
 from .inventory import InventoryItem
 from .land import LandParcel
 from .pending_action import PendingAction
-from .document import Document
+from .document import Document, DocumentBlob
+from .search_entry import SearchEntry
+from .corporate_developer import CorporateDeveloper
+from .audit_log import AuditLog
+from .job import Job
 
 __all__ = [
     "User",
+    "Employee",
     "Lead", 
     "Developer",
     "Contact",
@@ -17,5 +23,10 @@ __all__ = [
     "InventoryItem",
     "LandParcel",
     "PendingAction",
-    "Document"
+    "Document",
+    "DocumentBlob",
+    "SearchEntry",
+    "CorporateDeveloper",
+    "AuditLog",
+    "Job"
 ]
\ No newline at end of file
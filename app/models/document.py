@@ -7,7 +7,7 @@ class Document(Base):
     __tablename__ = "documents"
 
     id = Column(String, primary_key=True, index=True)
-    module = Column(String(50), nullable=False)
+    entity = Column(String(50), nullable=False)
     entity_id = Column(String, nullable=False)
     label = Column(String(255))
     filename = Column(String(255), nullable=False)
@@ -15,9 +15,25 @@ class Document(Base):
     file_size = Column(Integer)
     r2_key = Column(String(255), nullable=False)
     public_url = Column(String(255))
+    sha256 = Column(String(64), ForeignKey("document_blobs.sha256"), index=True)  # NULL: file not deduplicated
+    thumbnail_key = Column(String(255))  # set by the background thumbnail job
+    thumbnail_url = Column(String(255))
     uploaded_by = Column(String, ForeignKey("employees.id"), nullable=False)
-    uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
+    uploaded_by_name = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    uploader = relationship("Employee", foreign_keys=[uploaded_by])
\ No newline at end of file
+    uploader = relationship("Employee", foreign_keys=[uploaded_by])
+    blob = relationship("DocumentBlob")
+
+class DocumentBlob(Base):
+    """One stored file per distinct content, shared by every Document with that SHA-256"""
+    __tablename__ = "document_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    r2_key = Column(String(255), nullable=False)
+    public_url = Column(String(255))
+    size = Column(Integer, nullable=False)
+    content_type = Column(String(100))
+    ref_count = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, Enum, ForeignKey, JSON
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+import enum
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    params = Column(JSON)
+    input_key = Column(String(255))  # uploaded input file, removed once the job finishes
+    progress = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+    artifact_key = Column(String(255))  # stored output file, e.g. an export
+    artifact_filename = Column(String(255))
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100))
+    created_by = Column(String, ForeignKey("employees.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))  # lease: renewed while a worker runs the job
+    finished_at = Column(DateTime(timezone=True))
+
+    # Relationships
+    creator = relationship("Employee", foreign_keys=[created_by])
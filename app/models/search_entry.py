@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class SearchEntry(Base):
+    __tablename__ = "search_index"
+
+    id = Column(String, primary_key=True, index=True)  # "<entity_type>:<entity_id>"
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(String, nullable=False)
+    title = Column(String(255))
+    subtitle = Column(String(255))
+    search_text = Column(Text, nullable=False)  # lowercased searchable fields
+    owner_id = Column(String)     # lead visibility for non-admin users
+    assignee_id = Column(String)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("idx_search_index_entity", "entity_type", "entity_id"),
+    )
@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
+# entity and entity_id become storage key segments, so no "/" or ".."
+KEY_SEGMENT_PATTERN = r"^[A-Za-z0-9_-]+$"
+
 class DocumentBase(BaseModel):
     entity: str
     entity_id: str
@@ -17,6 +20,7 @@ class DocumentCreate(DocumentBase):
 
 class DocumentResponse(DocumentBase):
     id: str
+    thumbnail_url: Optional[str] = None
     uploaded_by: str
     uploaded_by_name: str
     created_at: datetime
@@ -24,6 +28,17 @@ class DocumentResponse(DocumentBase):
     class Config:
         from_attributes = True
 
+class DocumentPresignRequest(BaseModel):
+    entity: str = Field(..., max_length=64, pattern=KEY_SEGMENT_PATTERN)
+    entity_id: str = Field(..., max_length=64, pattern=KEY_SEGMENT_PATTERN)
+    filename: str
+    content_type: Optional[str] = None
+    file_size: Optional[int] = None
+
+class DocumentCompleteRequest(BaseModel):
+    upload_token: str
+    label: str
+
 class DocumentsListResponse(BaseModel):
     ok: bool = True
     data: list[DocumentResponse]
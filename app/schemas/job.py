@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Literal, Optional
+from datetime import datetime
+
+class LeadExportParams(BaseModel):
+    """Filters of a leads_export job, as on GET /leads"""
+    q: Optional[str] = None
+    city: Optional[str] = None
+    type_of_space: Optional[str] = None
+    transaction_type: Optional[str] = None
+    status: Optional[str] = None
+    owner: Literal["me", "all"] = "me"
+    format: Literal["csv", "parquet", "arrow"] = "csv"
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    params: Optional[Dict[str, Any]] = None
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int
+    download_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
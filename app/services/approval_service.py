@@ -1,5 +1,5 @@
 from typing import Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.pending_action import PendingAction
 from app.models.lead import Lead
 from app.models.corporate_developer import CorporateDeveloper
@@ -11,7 +11,7 @@ from app.utils.logging import logger
 import json
 
 async def create_pending_action(
-    db: Session,
+    db: AsyncSession,
     module: str,
     action_type: str,
     payload: Dict[str, Any],
@@ -20,7 +20,7 @@ async def create_pending_action(
 ) -> PendingAction:
     """Create a new pending action for employee requests"""
     
-    requester = db.query(Employee).filter(Employee.id == requested_by).first()
+    requester = await db.get(Employee, requested_by)
     if not requester:
         raise AppException(
             code="USER_NOT_FOUND",
@@ -38,8 +38,8 @@ async def create_pending_action(
     )
     
     db.add(pending_action)
-    db.commit()
-    db.refresh(pending_action)
+    await db.commit()
+    await db.refresh(pending_action)
     
     logger.info(
         "Pending action created",
@@ -53,7 +53,7 @@ async def create_pending_action(
     
     return pending_action
 
-async def apply_pending_action(action: PendingAction, admin_user: Employee, db: Session) -> None:
+async def apply_pending_action(action: PendingAction, admin_user: Employee, db: AsyncSession) -> None:
     """Apply a pending action to the database"""
     module = action.module
     action_type = action.action_type.value
@@ -107,7 +107,7 @@ async def apply_pending_action(action: PendingAction, admin_user: Employee, db:
         )
         raise
 
-async def _apply_create_action(module: str, payload: Dict[str, Any], admin_user: Employee, db: Session) -> None:
+async def _apply_create_action(module: str, payload: Dict[str, Any], admin_user: Employee, db: AsyncSession) -> None:
     """Apply create action"""
     # Add required fields
     create_data = {
@@ -145,13 +145,13 @@ async def _apply_create_action(module: str, payload: Dict[str, Any], admin_user:
     )
     db.add(audit_log)
 
-async def _apply_update_action(module: str, target_id: str, payload: Dict[str, Any], admin_user: Employee, db: Session) -> None:
+async def _apply_update_action(module: str, target_id: str, payload: Dict[str, Any], admin_user: Employee, db: AsyncSession) -> None:
     """Apply update action"""
     # Get the appropriate model
     if module == "leads":
-        obj = db.query(Lead).filter(Lead.id == target_id).first()
+        obj = await db.get(Lead, target_id)
     elif module == "corporate_developers":
-        obj = db.query(CorporateDeveloper).filter(CorporateDeveloper.id == target_id).first()
+        obj = await db.get(CorporateDeveloper, target_id)
     else:
         raise AppException(
             code="INVALID_MODULE",
@@ -189,13 +189,13 @@ async def _apply_update_action(module: str, target_id: str, payload: Dict[str, A
     )
     db.add(audit_log)
 
-async def _apply_delete_action(module: str, target_id: str, admin_user: Employee, db: Session) -> None:
+async def _apply_delete_action(module: str, target_id: str, admin_user: Employee, db: AsyncSession) -> None:
     """Apply delete action"""
     # Get the appropriate model
     if module == "leads":
-        obj = db.query(Lead).filter(Lead.id == target_id).first()
+        obj = await db.get(Lead, target_id)
     elif module == "corporate_developers":
-        obj = db.query(CorporateDeveloper).filter(CorporateDeveloper.id == target_id).first()
+        obj = await db.get(CorporateDeveloper, target_id)
     else:
         raise AppException(
             code="INVALID_MODULE",
@@ -214,7 +214,7 @@ async def _apply_delete_action(module: str, target_id: str, admin_user: Employee
     before_data = {column.name: getattr(obj, column.name) for column in obj.__table__.columns}
     
     # Delete object
-    db.delete(obj)
+    await db.delete(obj)
     
     # Log to audit
     audit_log = AuditLog(
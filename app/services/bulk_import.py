@@ -0,0 +1,166 @@
+import asyncio
+import csv
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Set, Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.process_pool import ProcessPool
+from app.models.search_entry import SearchEntry
+from app.services.csv_service import iter_row_chunks, validate_rows
+from app.services.search_service import SEARCH_SOURCES, search_entry_rows
+
+# Validates CSV chunks in parallel once an import spans more than one chunk
+validation_pool = ProcessPool(settings.IMPORT_WORKERS)
+
+def _insert(dialect_name: str, table):
+    # ON CONFLICT support lives on the dialect-specific insert constructs
+    if dialect_name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+class BulkInserter:
+    """Batched INSERT ... ON CONFLICT DO NOTHING that keeps a per-row error report
+
+    Each batch commits on its own. Rows whose unique_column already exists
+    are skipped and reported; a batch the database rejects is retried row
+    by row so only the failing rows are reported. At most max_errors
+    messages are kept, but every error is counted.
+    """
+
+    def __init__(self, db: AsyncSession, model: type, unique_column: str, batch_size: int, max_errors: int):
+        self.db = db
+        self.model = model
+        self.unique_column = unique_column
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.created = 0
+        self.error_count = 0
+        self.errors: List[str] = []
+
+    def report(self, errors: List[str]) -> None:
+        self.error_count += len(errors)
+        self.errors.extend(errors[:max(self.max_errors - len(self.errors), 0)])
+
+    async def _insert_batch(self, rows: List[Dict[str, Any]]) -> Set[Any]:
+        """Returns the unique values actually inserted"""
+        table = self.model.__table__
+        dialect_name = self.db.bind.dialect.name
+        statement = (
+            _insert(dialect_name, table)
+            .on_conflict_do_nothing(index_elements=[self.unique_column])
+            .returning(table.c[self.unique_column])
+        )
+        # executemany with RETURNING is sent as multi-row VALUES pages (insertmanyvalues)
+        inserted = set((await self.db.execute(statement, rows)).scalars())
+
+        if self.model in SEARCH_SOURCES and inserted:
+            # Core inserts skip the ORM events that normally maintain search_index
+            entries = search_entry_rows(self.model, [row for row in rows if row[self.unique_column] in inserted])
+            await self.db.execute(_insert(dialect_name, SearchEntry.__table__).on_conflict_do_nothing(), entries)
+        return inserted
+
+    async def _write_batch(self, rows: List[Tuple[int, Dict[str, Any]]]) -> None:
+        key = self.unique_column
+        batch = []
+        seen: Set[Any] = set()
+        for row_number, values in rows:
+            if values[key] in seen:
+                self.report([f"Row {row_number}: {key} {values[key]} is duplicated in the file"])
+                continue
+            seen.add(values[key])
+            batch.append((row_number, values))
+
+        failed: Set[Any] = set()
+        try:
+            inserted = await self._insert_batch([values for _, values in batch])
+            await self.db.commit()
+        except DBAPIError:
+            await self.db.rollback()
+            inserted = set()
+            for row_number, values in batch:
+                try:
+                    inserted |= await self._insert_batch([values])
+                    await self.db.commit()
+                except DBAPIError as e:
+                    await self.db.rollback()
+                    failed.add(values[key])
+                    self.report([f"Row {row_number}: {str(e.orig).strip().splitlines()[0]}"])
+
+        self.created += len(inserted)
+        self.report([
+            f"Row {row_number}: {key} {values[key]} already exists"
+            for row_number, values in batch
+            if values[key] not in inserted and values[key] not in failed
+        ])
+
+    async def write(self, rows: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Insert (row_number, values) pairs, batch_size rows per statement and commit"""
+        for start in range(0, len(rows), self.batch_size):
+            await self._write_batch(rows[start:start + self.batch_size])
+
+async def import_csv(
+    reader: csv.DictReader,
+    model_class: Type[BaseModel],
+    inserter: BulkInserter,
+    prepare_row: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream CSV rows through validation into the database, yielding progress per chunk
+
+    Rows are parsed IMPORT_CHUNK_ROWS at a time and validated on the
+    validation pool (the first chunk on a thread, so small files never start
+    it) while earlier chunks are written. Only a few chunks are in flight,
+    so memory does not grow with the file. The last event has done=True.
+    """
+    chunk_rows = settings.IMPORT_CHUNK_ROWS
+    chunks = iter_row_chunks(reader, chunk_rows)
+    in_flight = validation_pool.max_workers * 2 if validation_pool.enabled else 1
+    pending: Deque[asyncio.Future] = deque()
+    processed = 0
+
+    async def write_next() -> Dict[str, Any]:
+        nonlocal processed
+        validated, errors, size = await pending.popleft()
+        inserter.report(errors)
+        await inserter.write([(row_number, prepare_row(values)) for row_number, values in validated])
+        processed += size
+        return {"processed": processed, "created": inserter.created, "error_count": inserter.error_count}
+
+    async def validate(chunk: List[Tuple[int, Dict[str, Any]]], parallel: bool) -> Tuple[list, list, int]:
+        if parallel:
+            validated, errors = await validation_pool.run(validate_rows, model_class, chunk)
+        else:
+            validated, errors = await run_in_threadpool(validate_rows, model_class, chunk)
+        return validated, errors, len(chunk)
+
+    try:
+        read = 0
+        while True:
+            try:
+                chunk = await run_in_threadpool(next, chunks, None)
+            except (UnicodeDecodeError, csv.Error) as e:
+                # Every row decoded before the error is still imported; report where reading stopped
+                inserter.report([f"Rows {read + 1} onward were not imported: could not read the file ({str(e)})"])
+                break
+            if chunk is None:
+                break
+            read += len(chunk)
+            pending.append(asyncio.ensure_future(validate(chunk, validation_pool.enabled and read > chunk_rows)))
+            if len(pending) >= in_flight:
+                yield await write_next()
+        while pending:
+            yield await write_next()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    yield {
+        "done": True,
+        "processed": processed,
+        "created": inserter.created,
+        "error_count": inserter.error_count,
+        "errors": inserter.errors
+    }
@@ -0,0 +1,140 @@
+import enum
+import json
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlalchemy as sa
+from starlette.concurrency import run_in_threadpool
+
+# Imported lazily by export_service: pyarrow is only loaded once a columnar export is requested
+
+Converter = Optional[Callable[[Any], Any]]
+
+class _ChunkSink:
+    """Write-only file object that hands back what was written since the last drain"""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, enum.Enum) else value
+
+def _arrow_field(column: Any) -> Tuple[pa.Field, Converter]:
+    """Arrow field for a selected column, from its SQLAlchemy type, and a value converter if needed"""
+    column_type = column.type
+    nullable = getattr(column, "nullable", True)
+    if isinstance(column_type, sa.Enum):
+        # Dictionary-encoded: loads as a pandas categorical
+        arrow_type, converter = pa.dictionary(pa.int32(), pa.string()), _enum_value
+    elif isinstance(column_type, sa.Boolean):
+        arrow_type, converter = pa.bool_(), None
+    elif isinstance(column_type, sa.Integer):
+        arrow_type, converter = pa.int64(), None
+    elif isinstance(column_type, sa.Float):
+        arrow_type, converter = pa.float64(), float
+    elif isinstance(column_type, sa.Numeric):
+        if column_type.precision:
+            arrow_type, converter = pa.decimal128(column_type.precision, column_type.scale or 0), None
+        else:
+            arrow_type, converter = pa.float64(), float
+    elif isinstance(column_type, sa.DateTime):
+        arrow_type, converter = pa.timestamp("us", tz="UTC" if column_type.timezone else None), None
+    elif isinstance(column_type, sa.Date):
+        arrow_type, converter = pa.date32(), None
+    elif isinstance(column_type, sa.JSON):
+        arrow_type, converter = pa.string(), json.dumps
+    elif isinstance(column_type, sa.String):
+        arrow_type, converter = pa.string(), None
+    else:
+        arrow_type, converter = pa.string(), str
+    return pa.field(column.key, arrow_type, nullable=nullable), converter
+
+def arrow_schema(columns: Sequence[Any]) -> Tuple[pa.Schema, List[Converter]]:
+    """Arrow schema for a statement's selected columns, plus per-column value converters"""
+    fields, converters = zip(*(_arrow_field(column) for column in columns))
+    return pa.schema(fields), list(converters)
+
+def _record_batch(schema: pa.Schema, converters: List[Converter], rows: Sequence[Sequence[Any]]) -> pa.RecordBatch:
+    values = list(zip(*rows))
+    arrays = []
+    for index, (field, converter) in enumerate(zip(schema, converters)):
+        column = values[index]
+        if converter is not None:
+            column = [None if value is None else converter(value) for value in column]
+        arrays.append(pa.array(column, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+async def iter_parquet(
+    columns: Sequence[Any],
+    row_batches: AsyncIterator[Sequence[Sequence[Any]]],
+    row_group_size: int
+) -> AsyncIterator[bytes]:
+    """Encode row batches as a zstd Parquet file, one row group per row_group_size rows
+
+    Cursor batches are converted to Arrow as they arrive, so only one row
+    group is held in memory. Encoding runs on the threadpool.
+    """
+    schema, converters = arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    pending: List[pa.RecordBatch] = []
+    pending_rows = 0
+
+    async def write_row_group() -> bytes:
+        table = pa.Table.from_batches(pending, schema=schema)
+        await run_in_threadpool(writer.write_table, table, table.num_rows)
+        pending.clear()
+        return sink.drain()
+
+    async for rows in row_batches:
+        if not rows:
+            continue
+        pending.append(await run_in_threadpool(_record_batch, schema, converters, rows))
+        pending_rows += len(rows)
+        if pending_rows >= row_group_size:
+            pending_rows = 0
+            yield await write_row_group()
+
+    if pending:
+        yield await write_row_group()
+    await run_in_threadpool(writer.close)
+    yield sink.drain()
+
+async def iter_arrow_stream(
+    columns: Sequence[Any],
+    row_batches: AsyncIterator[Sequence[Sequence[Any]]]
+) -> AsyncIterator[bytes]:
+    """Encode row batches as an Arrow IPC stream, one zstd record batch per cursor batch"""
+    schema, converters = arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+    async for rows in row_batches:
+        if not rows:
+            continue
+        batch = await run_in_threadpool(_record_batch, schema, converters, rows)
+        await run_in_threadpool(writer.write_batch, batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,251 @@
+import re
+import types
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from itertools import repeat
+from operator import eq, itemgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Type, Union, get_args, get_origin
+from pydantic import BaseModel, EmailStr
+
+# Stands in for a value the fast path could not accept; its row goes through Pydantic
+INVALID = object()
+
+# Rows coerced together; small enough that a batch's columns stay in CPU cache
+BATCH_ROWS = 256
+
+_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+_DECIMAL = re.compile(r"-?[0-9]+(?:\.[0-9]+)?")
+# ASCII dot-atom local part, which email-validator leaves as it is
+_ATEXT = r"[a-zA-Z0-9_!#$%&'*+\-/=?^`{|}~]+"
+_LOCAL_PART = re.compile(rf"{_ATEXT}(?:\.{_ATEXT})*")
+_EMAIL_MAX_LENGTH = 254
+_EMAIL_DOMAIN_CACHE = 100000
+
+# Pydantic's lax str -> bool table
+_BOOLS = {
+    **dict.fromkeys(("1", "on", "t", "true", "y", "yes"), True),
+    **dict.fromkeys(("0", "off", "f", "false", "n", "no"), False),
+}
+
+def _parse_date(value: str) -> Any:
+    if not _DATE.fullmatch(value):
+        return INVALID
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return INVALID
+
+def _parse_decimal(value: str) -> Any:
+    return Decimal(value) if _DECIMAL.fullmatch(value) else INVALID
+
+def _parse_bool(value: str) -> Any:
+    return _BOOLS.get(value.lower(), INVALID)
+
+def _valid_email_domain(domain: str) -> bool:
+    """Whether email-validator accepts domain unchanged (so already lowercase)"""
+    import email_validator
+
+    try:
+        validated = email_validator.validate_email(f"a@{domain}", check_deliverability=False)
+    except email_validator.EmailNotValidError:
+        return False
+    return validated.domain == domain
+
+def _lowercased_mailboxes() -> frozenset:
+    """Local parts email-validator lowercases (postmaster, abuse, ...); older releases have none"""
+    from email_validator import rfc_constants
+
+    return frozenset(getattr(rfc_constants, "CASE_INSENSITIVE_MAILBOX_NAMES", ()))
+
+def _email_parser() -> Callable[[str], Any]:
+    """Parser returning the address as EmailStr would normalize it, or INVALID when only email-validator can tell
+
+    Domains are checked with email-validator itself, once per distinct domain.
+    """
+    domains: Dict[str, bool] = {}
+    lowercased = _lowercased_mailboxes()
+
+    def parse(value: str) -> Any:
+        local, _, domain = value.rpartition("@")
+        valid_domain = domains.get(domain)
+        if valid_domain is None:
+            if len(domains) >= _EMAIL_DOMAIN_CACHE:
+                domains.clear()
+            valid_domain = domains[domain] = _valid_email_domain(domain)
+        if (
+            not valid_domain
+            or len(value) > _EMAIL_MAX_LENGTH
+            or not _LOCAL_PART.fullmatch(local)
+            or local.lower() in lowercased
+        ):
+            return INVALID
+        return value
+
+    return parse
+
+def _enum_parser(enum_class: Type[Enum]) -> Callable[[str], Any]:
+    members = {member.value: member for member in enum_class}
+    return lambda value: members.get(value, INVALID)
+
+def _parser(annotation: Any) -> Optional[Callable[[str], Any]]:
+    """Parser for a field's non-None type; None for str, which needs none"""
+    if annotation is str:
+        return None
+    if annotation is EmailStr:
+        return _email_parser()
+    if annotation is date:
+        return _parse_date
+    if annotation is Decimal:
+        return _parse_decimal
+    if annotation is bool:
+        return _parse_bool
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _enum_parser(annotation)
+    raise TypeError(f"No columnar parser for {annotation!r}")
+
+class _Field(NamedTuple):
+    name: str
+    parser: Optional[Callable[[str], Any]]
+    nullable: bool
+    required: bool
+    default: Any
+
+def _plan_field(name: str, field: Any) -> _Field:
+    annotation = field.annotation
+    nullable = False
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1 or len(args) == len(get_args(annotation)):
+            raise TypeError(f"Unsupported union for {name}")
+        annotation, nullable = args[0], True
+
+    if field.alias or field.metadata or field.default_factory is not None:
+        raise TypeError(f"Field {name} has aliases, constraints or a default factory")
+    default = None if field.is_required() else field.default
+    if not isinstance(default, (type(None), str, bool, Decimal, date, Enum)):
+        raise TypeError(f"Field {name} has a mutable default")
+    return _Field(name, _parser(annotation), nullable, field.is_required(), default)
+
+class ColumnarValidator:
+    """Validates chunks of CSV rows a column at a time instead of one model per row
+
+    Each column is coerced with plain lookups, regexes and date/Decimal
+    parsing, once per distinct value, accepting only inputs whose Pydantic
+    result is certain. Rows holding anything else are handed back for
+    per-row Pydantic validation, which decides them and words their errors.
+    """
+
+    def __init__(self, fields: List[_Field]):
+        self.fields = fields
+
+    def _column(
+        self,
+        field: _Field,
+        raw: Optional[Tuple[Optional[str], ...]],
+        size: int,
+        parsed: Dict[Optional[str], Any]
+    ) -> Tuple[List[Any], bool]:
+        """Coerced values of one field across a batch, and whether any were rejected
+
+        parsed maps raw values already seen in the chunk to their result, so
+        values that repeat (dates, enums, email addresses) are parsed once.
+        """
+        if raw is None:
+            if field.required:
+                return [INVALID] * size, True
+            return [field.default] * size, False
+
+        if field.parser is None:
+            # Same cleaning as the per-row path: strip, and empty cells become None
+            values = [value.strip() if value else None for value in raw]
+            if not field.nullable and None in values:
+                return [INVALID if value is None else value for value in values], True
+            return values, False
+
+        for value in set(raw).difference(parsed):
+            cleaned = value.strip() if value else None
+            if cleaned is None:
+                parsed[value] = None if field.nullable else INVALID
+            else:
+                parsed[value] = field.parser(cleaned)
+        values = list(map(parsed.__getitem__, raw))
+        return values, INVALID in values
+
+    def _validate_batch(
+        self,
+        rows: List[Dict[str, Optional[str]]],
+        parsed: Dict[str, Dict[Optional[str], Any]]
+    ) -> Tuple[List[Optional[Dict[str, Any]]], Set[int]]:
+        header = rows[0].keys() - {None}
+        # Rows with other columns, like DictReader's None key of surplus cells, are left to the per-row path
+        matches = list(map(eq, repeat(header), map(dict.keys, rows)))
+        misshapen: Set[int] = set()
+        if not all(matches):
+            misshapen = {index for index, match in enumerate(matches) if not match}
+            placeholder = dict.fromkeys(header)
+            rows = [row if match else placeholder for row, match in zip(rows, matches)]
+
+        present = [field.name for field in self.fields if field.name in header]
+        # One transpose in C instead of a dict lookup per cell
+        cells = list(map(itemgetter(*present), rows)) if present else []
+        if len(present) == 1:
+            cells = [(cell,) for cell in cells]
+        raw_columns = dict(zip(present, zip(*cells))) if cells else dict.fromkeys(present, ())
+
+        rejected = set(misshapen)
+        columns = []
+        for field in self.fields:
+            values, has_invalid = self._column(field, raw_columns.get(field.name), len(rows), parsed[field.name])
+            if has_invalid:
+                rejected.update(index for index, value in enumerate(values) if value is INVALID)
+            columns.append(values)
+
+        # Filled a column at a time into presized copies, which beats dict(zip()) per row
+        template = dict.fromkeys(field.name for field in self.fields)
+        coerced: List[Optional[Dict[str, Any]]] = [template.copy() for _ in rows]
+        for field, values in zip(self.fields, columns):
+            name = field.name
+            for row, value in zip(coerced, values):
+                row[name] = value
+        for index in rejected:
+            row = coerced[index]
+            coerced[index] = None if index in misshapen else {
+                name: value for name, value in row.items() if value is not INVALID
+            }
+        return coerced, rejected
+
+    def validate(
+        self,
+        rows: List[Dict[str, Optional[str]]]
+    ) -> Tuple[List[Optional[Dict[str, Any]]], Set[int]]:
+        """Coerce a chunk of raw rows; returns a dict per row and the indexes of rejected rows
+
+        The dict of a rejected row holds only the fields that did pass, or is
+        None when the row's columns differ from the rest of its batch.
+
+        Works through the chunk BATCH_ROWS rows at a time, so the columns of
+        a batch stay in CPU cache across passes.
+        """
+        coerced: List[Optional[Dict[str, Any]]] = []
+        rejected: Set[int] = set()
+        parsed: Dict[str, Dict[Optional[str], Any]] = {field.name: {} for field in self.fields}
+        for start in range(0, len(rows), BATCH_ROWS):
+            batch_coerced, batch_rejected = self._validate_batch(rows[start:start + BATCH_ROWS], parsed)
+            coerced.extend(batch_coerced)
+            rejected.update(start + index for index in batch_rejected)
+        return coerced, rejected
+
+@lru_cache(maxsize=None)
+def columnar_validator(model_class: Type[BaseModel]) -> Optional[ColumnarValidator]:
+    """Validator for model_class, or None when its fields or validators are beyond the fast path"""
+    decorators = model_class.__pydantic_decorators__
+    if any((decorators.validators, decorators.field_validators, decorators.root_validators, decorators.model_validators)):
+        return None
+    if set(model_class.model_config) - {"from_attributes"}:
+        return None
+    try:
+        return ColumnarValidator([_plan_field(name, field) for name, field in model_class.model_fields.items()])
+    except TypeError:
+        return None
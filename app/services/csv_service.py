@@ -1,88 +1,148 @@
 import csv
 import io
-from typing import List, Dict, Any, Type
+import zlib
+from operator import itemgetter
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+from fastapi import Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ValidationError
+from app.services.columnar_validation import columnar_validator
 
-def export_to_csv(data: List[Dict[str, Any]], filename: str) -> StreamingResponse:
-    """Export data to CSV format"""
-    if not data:
-        # Return empty CSV with headers
-        output = io.StringIO()
-        output.write("# No data available\n")
-        output.seek(0)
-        
-        return StreamingResponse(
-            io.BytesIO(output.getvalue().encode()),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
-        )
-    
-    # Get headers from first row
-    headers = list(data[0].keys())
-    
-    # Create CSV content
+def csv_value(value: Any) -> str:
+    """Render one cell: enums by value, dates as ISO 8601, None as empty"""
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+async def iter_csv(
+    columns: Sequence[str],
+    row_batches: AsyncIterator[Sequence[Sequence[Any]]],
+    formatted: Optional[Sequence[int]] = None
+) -> AsyncIterator[bytes]:
+    """Encode batches of rows as CSV, one chunk per batch, header first
+
+    Only the cells at the formatted indexes go through csv_value (all of them
+    when None); csv.writer renders the rest itself, which is much cheaper.
+    """
+    if formatted is None:
+        formatted = range(len(columns))
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=headers)
-    writer.writeheader()
+    writer = csv.writer(output)
+    writer.writerow(columns)
+    yield output.getvalue().encode()
     
-    for row in data:
-        # Convert complex types to strings
-        csv_row = {}
-        for key, value in row.items():
-            if isinstance(value, (dict, list)):
-                csv_row[key] = str(value)
-            elif value is None:
-                csv_row[key] = ""
-            else:
-                csv_row[key] = str(value)
-        writer.writerow(csv_row)
-    
-    output.seek(0)
-    
-    return StreamingResponse(
-        io.BytesIO(output.getvalue().encode()),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
-    )
+    async for rows in row_batches:
+        output.seek(0)
+        output.truncate()
+        if formatted:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for index in formatted:
+                    row[index] = csv_value(row[index])
+        writer.writerows(rows)
+        yield output.getvalue().encode()
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally into a single gzip member"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def csv_stream_response(request: Request, body: AsyncIterator[bytes], filename: str) -> StreamingResponse:
+    """Stream encoded CSV as a download, gzip-compressed when the client accepts it"""
+    headers = {"Content-Disposition": f"attachment; filename={filename}.csv", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="text/csv", headers=headers)
+
+def _validation_error(row_number: int, e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        error_details = []
+        for error in e.errors():
+            field = ".".join(str(x) for x in error["loc"])
+            error_details.append(f"{field}: {error['msg']}")
+        return f"Row {row_number}: {'; '.join(error_details)}"
+    return f"Row {row_number}: {str(e)}"
+
+def _validate_row(
+    model_class: Type[BaseModel],
+    row: Dict[str, Optional[str]],
+    passed: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    # Clean empty values
+    cleaned_row = {k: v.strip() if v else None for k, v in row.items()}
+    if not passed:
+        return model_class(**cleaned_row).model_dump()
+
+    # Fields the columnar pass already coerced are handed over as such, and
+    # optional ones left out, so Pydantic only re-checks (and reports) the rest
+    fields = model_class.model_fields
+    skipped = {name: value for name, value in passed.items() if not fields[name].is_required()}
+    cleaned_row.update((name, value) for name, value in passed.items() if name not in skipped)
+    for name in skipped:
+        cleaned_row.pop(name, None)
+    return {**model_class(**cleaned_row).model_dump(), **skipped}
+
+def validate_rows(
+    model_class: Type[BaseModel],
+    rows: List[Tuple[int, Dict[str, Optional[str]]]]
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[str]]:
+    """Validate (row_number, raw CSV row) pairs; returns valid rows and per-row errors
+
+    Rows go through the columnar fast path first when the model allows it;
+    only the rows it rejects are validated one Pydantic model at a time.
+    Module-level and side-effect free so chunks can be validated in worker processes.
+    """
+    validator = columnar_validator(model_class)
+    if validator is not None:
+        coerced, rejected = validator.validate(list(map(itemgetter(1), rows)))
+    else:
+        coerced, rejected = [None] * len(rows), range(len(rows))
+
+    errors = []
+    for index in sorted(rejected):
+        i, row = rows[index]
+        try:
+            coerced[index] = _validate_row(model_class, row, coerced[index])
+        except Exception as e:
+            coerced[index] = None
+            errors.append(_validation_error(i, e))
+    valid_rows = [(i, values) for (i, _), values in zip(rows, coerced) if values is not None]
+    return valid_rows, errors
+
+def open_csv_reader(binary_file: BinaryIO) -> csv.DictReader:
+    """DictReader decoding the file incrementally; raises ValueError without a header row"""
+    reader = csv.DictReader(io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline=""))
+    if not reader.fieldnames:
+        raise ValueError("CSV file has no headers")
+    return reader
+
+def iter_row_chunks(reader: csv.DictReader, chunk_rows: int) -> Iterator[List[Tuple[int, Dict[str, Optional[str]]]]]:
+    """Lazily group CSV rows into chunks of (row_number, row), so memory is bounded by chunk_rows
 
-def import_from_csv(csv_content: str, model_class: Type[BaseModel]) -> Dict[str, Any]:
-    """Import data from CSV content with validation"""
+    A decoding or CSV error first yields the rows read before it, then is
+    raised on the next call.
+    """
+    chunk = []
     try:
-        reader = csv.DictReader(io.StringIO(csv_content))
-        
-        # Validate headers
-        if not reader.fieldnames:
-            raise ValueError("CSV file has no headers")
-        
-        # Parse rows
-        valid_rows = []
-        errors = []
-        
         for i, row in enumerate(reader, 1):
-            try:
-                # Clean empty values
-                cleaned_row = {k: v.strip() if v else None for k, v in row.items()}
-                
-                # Validate with Pydantic model
-                validated_data = model_class(**cleaned_row)
-                valid_rows.append(validated_data.dict())
-                
-            except ValidationError as e:
-                error_details = []
-                for error in e.errors():
-                    field = ".".join(str(x) for x in error["loc"])
-                    error_details.append(f"{field}: {error['msg']}")
-                errors.append(f"Row {i}: {'; '.join(error_details)}")
-            except Exception as e:
-                errors.append(f"Row {i}: {str(e)}")
-        
-        return {
-            "valid_rows": valid_rows,
-            "errors": errors,
-            "total_rows": len(valid_rows),
-            "error_count": len(errors)
-        }
-        
-    except Exception as e:
-        raise ValueError(f"Failed to parse CSV: {str(e)}")
\ No newline at end of file
+            chunk.append((i, row))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+    except (UnicodeDecodeError, csv.Error):
+        if chunk:
+            yield chunk
+        raise
+    if chunk:
+        yield chunk
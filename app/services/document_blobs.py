@@ -0,0 +1,78 @@
+from typing import Optional
+from fastapi import UploadFile
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.document import DocumentBlob
+from app.services.file_upload import FileUploadService, file_upload_service
+
+class DocumentBlobStore:
+    """Content-addressed document files: one stored object per SHA-256, shared by reference count
+
+    Reference counts change in the caller's transaction, so they commit or
+    roll back together with the Document rows that hold them.
+    """
+
+    def __init__(self, uploads: FileUploadService):
+        self.uploads = uploads
+
+    async def _acquire(self, db: AsyncSession, sha256: str) -> Optional[DocumentBlob]:
+        result = await db.execute(
+            update(DocumentBlob)
+            .where(DocumentBlob.sha256 == sha256)
+            .values(ref_count=DocumentBlob.ref_count + 1)
+        )
+        if not result.rowcount:
+            return None
+        return await db.get(DocumentBlob, sha256, populate_existing=True)
+
+    async def store(self, db: AsyncSession, file: UploadFile, folder: str, max_size: Optional[int] = None) -> DocumentBlob:
+        """Take a reference to the blob for file's content, uploading it only if it is new"""
+        # The upload is already spooled locally, so hashing it first lets
+        # repeated files skip the trip to storage entirely
+        sha256 = await self.uploads.hash_file(file, max_size)
+        blob = await self._acquire(db, sha256)
+        if blob is not None:
+            return blob
+
+        stored = await self.uploads.upload_file(file, folder, max_size)
+        while True:
+            try:
+                async with db.begin_nested():
+                    blob = DocumentBlob(
+                        sha256=sha256,
+                        r2_key=stored["r2_key"],
+                        public_url=stored["public_url"],
+                        size=stored["size"],
+                        content_type=file.content_type or "application/octet-stream",
+                        ref_count=1
+                    )
+                    db.add(blob)
+                return blob
+            except IntegrityError:
+                # Same content stored concurrently: share that blob, drop ours
+                blob = await self._acquire(db, sha256)
+                if blob is not None:
+                    await self.uploads.delete_file(stored["r2_key"])
+                    return blob
+
+    async def release(self, db: AsyncSession, sha256: str) -> Optional[str]:
+        """Drop one reference; returns the r2_key to delete once the last one is gone
+
+        Flush the referencing Document's deletion first, and delete the
+        returned key from storage only after the transaction commits.
+        """
+        await db.execute(
+            update(DocumentBlob)
+            .where(DocumentBlob.sha256 == sha256)
+            .values(ref_count=DocumentBlob.ref_count - 1)
+        )
+        result = await db.execute(
+            delete(DocumentBlob)
+            .where(DocumentBlob.sha256 == sha256, DocumentBlob.ref_count <= 0)
+            .returning(DocumentBlob.r2_key)
+        )
+        return result.scalar_one_or_none()
+
+# Global instance
+document_blob_store = DocumentBlobStore(file_upload_service)
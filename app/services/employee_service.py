@@ -0,0 +1,13 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.employee import Employee
+
+async def get_employee_names(db: AsyncSession, employee_ids: Iterable[Optional[str]]) -> Dict[str, str]:
+    """Resolve employee names for a batch of ids with a single IN query"""
+    ids = {str(employee_id) for employee_id in employee_ids if employee_id}
+    if not ids:
+        return {}
+
+    result = await db.execute(select(Employee.id, Employee.name).where(Employee.id.in_(ids)))
+    return {str(employee_id): name for employee_id, name in result.all()}
@@ -0,0 +1,83 @@
+from datetime import date
+from enum import Enum
+from typing import Any, AsyncIterator, NamedTuple, Optional, Sequence
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.csv_service import csv_stream_response, iter_csv
+
+class ExportFormat(NamedTuple):
+    extension: str
+    media_type: str
+
+EXPORT_FORMATS = {
+    "csv": ExportFormat("csv", "text/csv"),
+    "parquet": ExportFormat("parquet", "application/vnd.apache.parquet"),
+    "arrow": ExportFormat("arrows", "application/vnd.apache.arrow.stream"),
+}
+
+def table_columns(model: type) -> list:
+    """Every column of a model's table, for plain-row (non-ORM) exports"""
+    return list(model.__table__.columns)
+
+async def stream_row_batches(statement: Select) -> AsyncIterator[Sequence[Any]]:
+    """Run statement on a server-side cursor, yielding EXPORT_BATCH_SIZE rows at a time
+
+    Uses its own session, since a streamed response outlives the request's
+    dependencies. Memory stays bounded by the batch size, however many rows match.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield rows
+
+def _needs_formatting(column: Any) -> bool:
+    """Enum and date/time cells need csv_value; csv.writer renders other types as-is"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return True
+    return issubclass(python_type, (Enum, date))
+
+def iter_export(
+    statement: Select,
+    format: str = "csv",
+    row_batches: Optional[AsyncIterator[Sequence[Any]]] = None
+) -> AsyncIterator[bytes]:
+    """Every row of statement encoded in one of EXPORT_FORMATS
+
+    CSV is headed by the selected column names; Parquet and Arrow carry a
+    typed schema derived from the columns' SQLAlchemy types. row_batches
+    defaults to streaming the statement; pass a wrapper around
+    stream_row_batches(statement) to observe progress.
+    """
+    columns = list(statement.selected_columns)
+    if row_batches is None:
+        row_batches = stream_row_batches(statement)
+
+    if format == "parquet":
+        from app.services.columnar_export import iter_parquet
+        return iter_parquet(columns, row_batches, settings.EXPORT_ROW_GROUP_SIZE)
+    if format == "arrow":
+        from app.services.columnar_export import iter_arrow_stream
+        return iter_arrow_stream(columns, row_batches)
+
+    formatted = [index for index, column in enumerate(columns) if _needs_formatting(column)]
+    return iter_csv([column.key for column in columns], row_batches, formatted)
+
+def export_csv(request: Request, statement: Select, filename: str) -> StreamingResponse:
+    """Stream every row of statement as a CSV download"""
+    return csv_stream_response(request, iter_export(statement), filename)
+
+def export_response(request: Request, statement: Select, filename: str, format: str = "csv") -> StreamingResponse:
+    """Stream every row of statement as a CSV (gzip when accepted), Parquet or Arrow download"""
+    if format == "csv":
+        return export_csv(request, statement, filename)
+    export_format = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        iter_export(statement, format),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}.{export_format.extension}"}
+    )
@@ -1,123 +1,104 @@
-import boto3
-from botocore.exceptions import ClientError
+from typing import Any, AsyncIterator, Dict, Optional
 from fastapi import UploadFile, HTTPException
 from app.core.config import settings
+from app.services.storage import LocalStorage, StorageBackend, build_storage
+from app.utils.errors import AppException
+import hashlib
 import uuid
 import os
 
+async def iter_upload_file(file: UploadFile) -> AsyncIterator[bytes]:
+    """Read an UploadFile in UPLOAD_CHUNK_SIZE chunks"""
+    while True:
+        chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+class UploadStream:
+    """Passes chunks through, enforcing a size cap and hashing as it goes"""
+    
+    def __init__(self, source: AsyncIterator[bytes], max_size: Optional[int] = None):
+        self.source = source
+        self.max_size = max_size
+        self.size = 0
+        self._digest = hashlib.sha256()
+    
+    async def chunks(self) -> AsyncIterator[bytes]:
+        async for chunk in self.source:
+            if not chunk:
+                continue
+            self.size += len(chunk)
+            if self.max_size is not None and self.size > self.max_size:
+                raise AppException(
+                    code="FILE_TOO_LARGE",
+                    message=f"File size exceeds {self.max_size // (1024 * 1024)}MB limit",
+                    status_code=400
+                )
+            self._digest.update(chunk)
+            yield chunk
+    
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
 class FileUploadService:
-    def __init__(self):
-        if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-            self.s3_client = boto3.client(
-                's3',
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_REGION
-            )
-            self.use_s3 = True
-        elif settings.R2_ACCESS_KEY_ID and settings.R2_SECRET_ACCESS_KEY:
-            self.s3_client = boto3.client(
-                's3',
-                endpoint_url=settings.R2_ENDPOINT,
-                aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-                region_name='auto'
-            )
-            self.use_s3 = True
-            self.bucket_name = settings.R2_BUCKET
-        else:
-            self.use_s3 = False
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        self.storage = storage or build_storage()
+    
+    async def hash_file(self, file: UploadFile, max_size: Optional[int] = None) -> str:
+        """SHA-256 of an already-received upload, rewound so it can still be stored"""
+        stream = UploadStream(iter_upload_file(file), max_size)
+        async for _ in stream.chunks():
+            pass
+        await file.seek(0)
+        return stream.sha256
     
-    async def upload_file(self, file: UploadFile, folder: str = "documents") -> Dict[str, str]:
-        """Upload file to S3/R2 or local storage"""
+    async def upload_file(self, file: UploadFile, folder: str = "documents", max_size: Optional[int] = None) -> Dict[str, Any]:
+        """Stream file to the configured storage backend in constant memory"""
         if not file.filename:
             raise HTTPException(status_code=400, detail="No file provided")
         
         # Generate unique filename
         file_extension = os.path.splitext(file.filename)[1]
         unique_filename = f"{uuid.uuid4()}{file_extension}"
+        stream = UploadStream(iter_upload_file(file), max_size)
         
-        if self.use_s3:
-            return await self._upload_to_s3(file, folder, unique_filename)
-        else:
-            return await self._upload_to_local(file, folder, unique_filename)
-    
-    async def _upload_to_s3(self, file: UploadFile, folder: str, filename: str) -> Dict[str, str]:
-        """Upload file to AWS S3 or Cloudflare R2"""
-        try:
-            key = f"{folder}/{filename}"
-            bucket_name = getattr(self, 'bucket_name', settings.AWS_BUCKET_NAME)
-            
-            self.s3_client.upload_fileobj(
-                file.file,
-                bucket_name,
-                key,
-                ExtraArgs={'ContentType': file.content_type}
-            )
-            
-            # Return the URL
-            if settings.R2_ENDPOINT:
-                public_url = f"{settings.R2_ENDPOINT}/{bucket_name}/{key}"
-            else:
-                public_url = f"https://{bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
-            
-            return {
-                "r2_key": key,
-                "public_url": public_url,
-                "filename": filename
-            }
-        
-        except ClientError as e:
-            raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
-    
-    async def _upload_to_local(self, file: UploadFile, folder: str, filename: str) -> Dict[str, str]:
-        """Upload file to local storage"""
         try:
-            # Create upload directory if it doesn't exist
-            upload_dir = f"uploads/{folder}"
-            os.makedirs(upload_dir, exist_ok=True)
-            
-            file_path = f"{upload_dir}/{filename}"
-            
-            # Save file
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            return {
-                "r2_key": file_path,
-                "public_url": f"/uploads/{folder}/{filename}",
-                "filename": filename
-            }
-        
+            stored = await self.storage.save(stream.chunks(), f"{folder}/{unique_filename}", file.content_type)
+        except (AppException, HTTPException):
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
+        
+        return {
+            **stored,
+            "filename": unique_filename,
+            "size": stream.size,
+            "sha256": stream.sha256
+        }
     
-    def delete_file(self, r2_key: str) -> bool:
-        """Delete file from S3/R2 or local storage"""
-        if self.use_s3:
-            return self._delete_from_s3(r2_key)
-        else:
-            return self._delete_from_local(r2_key)
+    async def upload_bytes(self, data: bytes, key: str, content_type: str) -> Dict[str, str]:
+        """Store small generated content (e.g. thumbnails) under an exact key"""
+        async def single_chunk() -> AsyncIterator[bytes]:
+            yield data
+        return await self.storage.save(single_chunk(), key, content_type)
     
-    def _delete_from_s3(self, r2_key: str) -> bool:
-        """Delete file from AWS S3 or Cloudflare R2"""
-        try:
-            bucket_name = getattr(self, 'bucket_name', settings.AWS_BUCKET_NAME)
-            self.s3_client.delete_object(Bucket=bucket_name, Key=r2_key)
-            return True
-        except Exception:
-            return False
+    async def upload_stream(self, chunks: AsyncIterator[bytes], key: str, content_type: str) -> Dict[str, str]:
+        """Store generated content of any size (e.g. export files) under an exact key"""
+        return await self.storage.save(chunks, key, content_type)
     
-    def _delete_from_local(self, file_path: str) -> bool:
-        """Delete file from local storage"""
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                return True
-            return False
-        except Exception:
-            return False
+    async def delete_file(self, r2_key: str) -> bool:
+        """Delete file from the configured storage backend"""
+        return await self.storage.delete(r2_key)
 
 # Global instance
-file_upload_service = FileUploadService()
\ No newline at end of file
+file_upload_service = FileUploadService()
+
+# Job inputs and export artifacts are only handed out through presigned
+# downloads, so on local disk they live outside the /uploads static mount
+job_file_service = FileUploadService(
+    LocalStorage(root=settings.JOB_FILES_DIR)
+    if isinstance(file_upload_service.storage, LocalStorage)
+    else file_upload_service.storage
+)
@@ -0,0 +1,247 @@
+import asyncio
+import csv
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy import and_, or_, select, update
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.employee import Employee
+from app.models.job import Job, JobStatus
+from app.models.lead import Lead
+from app.schemas.job import LeadExportParams
+from app.services.csv_service import open_csv_reader
+from app.services.export_service import EXPORT_FORMATS, iter_export, stream_row_batches
+from app.services.file_upload import job_file_service
+from app.services.lead_service import filter_leads, import_leads_csv, lead_export_statement
+from app.utils.errors import AppException
+from app.utils.logging import logger
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class JobOutcome(NamedTuple):
+    result: Dict[str, Any]
+    artifact_key: Optional[str] = None
+    artifact_filename: Optional[str] = None
+
+class JobKind(NamedTuple):
+    """How to run one kind of job, and what POST /jobs requires to queue it"""
+    handler: Callable[[Job, ProgressCallback], Awaitable[JobOutcome]]
+    params_model: Optional[Type[BaseModel]] = None
+    needs_file: bool = False
+    admin_only: bool = False
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+async def _import_leads(job: Job, progress: ProgressCallback) -> JobOutcome:
+    # Spooled to a local temp file so imports of any size stay in bounded memory
+    with tempfile.TemporaryFile() as buffer:
+        await job_file_service.storage.download(job.input_key, buffer)
+        await run_in_threadpool(buffer.seek, 0)
+        try:
+            reader = await run_in_threadpool(open_csv_reader, buffer)
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            raise AppException(code="INVALID_FILE", message=f"Failed to parse CSV: {str(e)}")
+
+        async with AsyncSessionLocal() as db:
+            async for summary in import_leads_csv(db, reader, job.created_by):
+                if not summary.get("done"):
+                    await progress(summary)
+
+    return JobOutcome({
+        "created": summary["created"],
+        "errors": summary["errors"],
+        "error_count": summary["error_count"],
+        "total_rows": summary["processed"]
+    })
+
+async def _export_leads(job: Job, progress: ProgressCallback) -> JobOutcome:
+    params = LeadExportParams(**(job.params or {}))
+    async with AsyncSessionLocal() as db:
+        user = await db.get(Employee, job.created_by)
+    if user is None:
+        raise AppException(code="USER_NOT_FOUND", message="The employee who queued this export no longer exists")
+
+    query, _ = filter_leads(
+        select(Lead), user, params.owner, params.q, params.city, params.type_of_space,
+        params.transaction_type, params.status, async_engine.dialect.name
+    )
+    statement = lead_export_statement(query)
+    exported = 0
+
+    async def counted_batches():
+        nonlocal exported
+        async for rows in stream_row_batches(statement):
+            yield rows
+            exported += len(rows)
+            await progress({"processed": exported})
+
+    export_format = EXPORT_FORMATS[params.format]
+    filename = f"leads.{export_format.extension}"
+    stored = await job_file_service.upload_stream(
+        iter_export(statement, params.format, counted_batches()), f"jobs/{job.id}/{filename}", export_format.media_type
+    )
+    return JobOutcome({"rows": exported}, stored["r2_key"], filename)
+
+JOB_KINDS: Dict[str, JobKind] = {
+    "leads_import": JobKind(_import_leads, needs_file=True, admin_only=True),
+    "leads_export": JobKind(_export_leads, params_model=LeadExportParams),
+}
+
+class JobWorker:
+    """Claims queued jobs and runs them, one at a time per worker process
+
+    A claim is a lease rather than a held row lock: the worker stamps its id
+    and keeps heartbeat_at fresh, and every later write is conditional on
+    still holding the lease. Jobs of a worker that died are claimed again
+    once their heartbeat is JOB_STALE_SECONDS old; a worker that finds its
+    lease gone cancels its run, so a job never runs on two workers for long.
+    """
+
+    def __init__(self, worker_id: str):
+        self.worker_id = worker_id
+
+    async def claim(self) -> Optional[Job]:
+        """Lease the oldest runnable job, or return None when there is none"""
+        while True:
+            now = _utcnow()
+            stale_before = now - timedelta(seconds=settings.JOB_STALE_SECONDS)
+            async with AsyncSessionLocal() as db:
+                # SKIP LOCKED: concurrent workers each take a different row, without waiting
+                job = (await db.execute(
+                    select(Job)
+                    .where(or_(
+                        Job.status == JobStatus.QUEUED,
+                        and_(Job.status == JobStatus.RUNNING, Job.heartbeat_at < stale_before)
+                    ))
+                    .order_by(Job.created_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )).scalar_one_or_none()
+                if job is None:
+                    return None
+
+                if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+                    job.status = JobStatus.FAILED
+                    job.error = f"Worker stopped responding ({job.attempts} attempts)"
+                    job.finished_at = now
+                    await db.commit()
+                    await self._discard_input(job)
+                    continue
+
+                job.status = JobStatus.RUNNING
+                job.attempts += 1
+                job.worker_id = self.worker_id
+                job.started_at = now
+                job.heartbeat_at = now
+                await db.commit()
+                return job
+
+    async def _update(self, job_id: str, **values: Any) -> bool:
+        """Write to a job this worker still holds the lease on"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.worker_id == self.worker_id, Job.status == JobStatus.RUNNING)
+                .values(heartbeat_at=_utcnow(), **values)
+            )
+            await db.commit()
+        return result.rowcount > 0
+
+    async def _heartbeat(self, job_id: str, done: asyncio.Event, on_lease_lost: Callable[[], None]) -> None:
+        # Stopped via done rather than cancel(), so it never dies halfway through a commit
+        while True:
+            try:
+                await asyncio.wait_for(done.wait(), settings.JOB_HEARTBEAT_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                if not await self._update(job_id):
+                    logger.warning("Job lease lost", extra={"job_id": job_id, "worker_id": self.worker_id})
+                    on_lease_lost()
+                    return
+            except Exception:
+                logger.warning("Job heartbeat failed", exc_info=True, extra={"job_id": job_id})
+
+    async def _discard_input(self, job: Job) -> None:
+        if job.input_key:
+            await job_file_service.delete_file(job.input_key)
+
+    async def run(self, job: Job) -> None:
+        """Run a claimed job to completion and record its outcome"""
+        kind = JOB_KINDS.get(job.kind)
+        done = asyncio.Event()
+        handler: Optional[asyncio.Task] = None
+        lease_lost = False
+
+        def abort() -> None:
+            # Another worker owns the job now; stop writing rather than run it twice
+            nonlocal lease_lost
+            lease_lost = True
+            if handler is not None:
+                handler.cancel()
+
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, done, abort))
+
+        async def progress(values: Dict[str, Any]) -> None:
+            # Progress is advisory: a failed write must not fail the job
+            try:
+                if not await self._update(job.id, progress=values):
+                    abort()
+            except Exception:
+                logger.warning("Job progress update failed", exc_info=True, extra={"job_id": job.id})
+
+        try:
+            if kind is None:
+                raise AppException(code="INVALID_JOB", message=f"Unknown job kind: {job.kind}")
+            handler = asyncio.create_task(kind.handler(job, progress))
+            outcome = await handler
+            values = {
+                "status": JobStatus.SUCCEEDED,
+                "result": outcome.result,
+                "artifact_key": outcome.artifact_key,
+                "artifact_filename": outcome.artifact_filename
+            }
+        except asyncio.CancelledError:
+            if not lease_lost:
+                raise
+            values = None
+        except AppException as e:
+            values = {"status": JobStatus.FAILED, "error": e.message}
+        except Exception:
+            logger.exception("Job failed", extra={"job_id": job.id, "kind": job.kind})
+            values = {"status": JobStatus.FAILED, "error": "Job failed unexpectedly"}
+        finally:
+            done.set()
+            await heartbeat
+
+        if values is None:
+            logger.warning("Job aborted, lease lost", extra={"job_id": job.id, "worker_id": self.worker_id})
+        elif await self._update(job.id, finished_at=_utcnow(), **values):
+            await self._discard_input(job)
+            logger.info("Job finished", extra={"job_id": job.id, "kind": job.kind, "status": values["status"].value})
+        else:
+            # Another worker took the job over meanwhile; its run is the one that counts
+            logger.warning("Job outcome dropped, lease lost", extra={"job_id": job.id, "worker_id": self.worker_id})
+
+    async def work(self, stop: asyncio.Event) -> None:
+        """Claim and run jobs until stop is set, polling every JOB_POLL_SECONDS when idle"""
+        while not stop.is_set():
+            try:
+                job = await self.claim()
+            except Exception:
+                logger.exception("Job claim failed", extra={"worker_id": self.worker_id})
+                job = None
+
+            if job is not None:
+                await self.run(job)
+                continue
+
+            try:
+                await asyncio.wait_for(stop.wait(), settings.JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,88 @@
+import csv
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from app.core.config import settings
+from app.models.employee import Employee
+from app.models.lead import Lead
+from app.schemas.lead import LeadCreate
+from app.services.bulk_import import BulkInserter, import_csv
+from app.services.search_service import search_leads
+from app.utils.ids import generate_id
+
+def filter_leads(
+    query: Select,
+    current_user: Employee,
+    owner: str,
+    q: Optional[str],
+    city: Optional[str],
+    type_of_space: Optional[str],
+    transaction_type: Optional[str],
+    status: Optional[str],
+    dialect_name: str
+) -> Tuple[Select, Optional[ColumnElement]]:
+    """Apply visibility and list filters; also returns the search relevance when q is given"""
+    # Apply ownership filter for non-admin users
+    if current_user.role.value != "admin":
+        if owner == "all":
+            # Employees can only see their own or assigned leads
+            query = query.filter(
+                or_(
+                    Lead.owner_id == current_user.id,
+                    Lead.assignee_id == current_user.id
+                )
+            )
+        else:
+            query = query.filter(Lead.owner_id == current_user.id)
+    elif owner == "me":
+        query = query.filter(Lead.owner_id == current_user.id)
+    
+    # Apply filters
+    rank = None
+    if q:
+        query, rank = search_leads(query, q, dialect_name)
+    if city:
+        query = query.filter(Lead.city.ilike(f"%{city}%"))
+    if type_of_space:
+        query = query.filter(Lead.type_of_space == type_of_space)
+    if transaction_type:
+        query = query.filter(Lead.transaction_type == transaction_type)
+    if status:
+        query = query.filter(Lead.status == status)
+    return query, rank
+
+def lead_export_statement(query: Select) -> Select:
+    """Plain-row version of a leads query with owner/assignee names joined in
+
+    Columns match the leads API's JSON serialization, so CSV exports keep their layout.
+    """
+    owner = aliased(Employee)
+    assignee = aliased(Employee)
+    lead_columns = [column for column in Lead.__table__.columns if column.key not in ("created_at", "updated_at")]
+    return (
+        query.with_only_columns(
+            *lead_columns,
+            owner.name.label("owner_name"),
+            assignee.name.label("assignee_name"),
+            Lead.created_at,
+            Lead.updated_at
+        )
+        .outerjoin(owner, owner.id == Lead.owner_id)
+        .outerjoin(assignee, assignee.id == Lead.assignee_id)
+        .order_by(Lead.created_at.desc(), Lead.id.desc())
+    )
+
+def import_leads_csv(db: AsyncSession, reader: csv.DictReader, owner_id: str) -> AsyncIterator[Dict[str, Any]]:
+    """Import a leads CSV owned by owner_id, yielding import_csv progress events
+
+    Batched INSERT ... ON CONFLICT (inquiry_no) DO NOTHING, committed per
+    batch, so re-running an interrupted import only adds the missing rows.
+    """
+    def prepare_row(row_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {**row_data, "id": generate_id(), "owner_id": owner_id}
+    
+    inserter = BulkInserter(db, Lead, "inquiry_no", settings.IMPORT_BATCH_SIZE, settings.IMPORT_MAX_ERRORS)
+    return import_csv(reader, LeadCreate, inserter, prepare_row)
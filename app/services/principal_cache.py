@@ -0,0 +1,55 @@
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.employee import Employee
+from app.utils.cache import ExpiringLRU
+
+class PrincipalCache:
+    """Short-lived LRU of active employees keyed by id, so auth skips the DB
+
+    Entries are transient Employee copies (never attached to a session) and
+    are dropped on expiry or when an Employee row is changed through the ORM.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries = ExpiringLRU(max_entries)
+
+    def get(self, user_id: str) -> Optional[Employee]:
+        if self.ttl_seconds <= 0:
+            return None
+        return self._entries.get(str(user_id))
+
+    def put(self, user: Employee) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        snapshot = Employee(**{
+            column.key: getattr(user, column.key)
+            for column in Employee.__table__.columns
+            if column.key != "password_hash"
+        })
+        self._entries.put(str(user.id), snapshot, self.ttl_seconds)
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(str(user_id))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_changed_employees(session: Session, flush_context) -> None:
+    """Drop cached principals for employees written in this flush"""
+    changed = [obj for obj in list(session.dirty) + list(session.deleted) if isinstance(obj, Employee)]
+    for user in changed:
+        principal_cache.invalidate(user.id)
+    if changed:
+        session.info.setdefault("changed_employee_ids", set()).update(str(user.id) for user in changed)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_employees(session: Session) -> None:
+    """Invalidate again at commit, in case a request re-cached the old row meanwhile"""
+    for user_id in session.info.pop("changed_employee_ids", ()):
+        principal_cache.invalidate(user_id)
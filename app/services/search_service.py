@@ -0,0 +1,204 @@
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from sqlalchemy import case, event, func, or_
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from app.models.contact import Contact
+from app.models.developer import Developer
+from app.models.employee import Employee
+from app.models.inventory import InventoryItem
+from app.models.land import LandParcel
+from app.models.lead import Lead
+from app.models.project import ProjectMaster
+from app.models.search_entry import SearchEntry
+
+# Columns covered by the leads `q` filter; each has a pg_trgm GIN index
+LEAD_SEARCH_COLUMNS = (
+    Lead.client_company,
+    Lead.contact_person,
+    Lead.email,
+    Lead.inquiry_no,
+)
+
+def _join(*parts: Any) -> str:
+    return " ".join(str(part) for part in parts if part)
+
+# Models mirrored into search_index: entity type, display title/subtitle and
+# the fields that make up the searchable text
+SEARCH_SOURCES: Dict[type, Dict[str, Any]] = {
+    Lead: {
+        "type": "lead",
+        "title": lambda o: o.client_company,
+        "subtitle": lambda o: _join(o.inquiry_no, o.contact_person),
+        "fields": ("inquiry_no", "client_company", "contact_person", "email", "contact_no", "city"),
+    },
+    Contact: {
+        "type": "contact",
+        "title": lambda o: _join(o.first_name, o.last_name),
+        "subtitle": lambda o: o.company_name or o.developer_name or o.individual_owner_name,
+        "fields": ("first_name", "last_name", "company_name", "developer_name", "individual_owner_name", "email_id", "contact_no", "city"),
+    },
+    Developer: {
+        "type": "developer",
+        "title": lambda o: o.name,
+        "subtitle": lambda o: o.ho_city,
+        "fields": ("name", "email_id", "contact_no", "ho_city", "presence_cities"),
+    },
+    InventoryItem: {
+        "type": "inventory",
+        "title": lambda o: o.name,
+        "subtitle": lambda o: _join(o.location, o.city),
+        "fields": ("name", "developer_owner_name", "email_id", "contact_no", "city", "location"),
+    },
+    ProjectMaster: {
+        "type": "project",
+        "title": lambda o: o.name,
+        "subtitle": lambda o: o.developer_owner,
+        "fields": ("name", "developer_owner", "email", "contact_no", "city", "location", "landmark"),
+    },
+    LandParcel: {
+        "type": "land",
+        "title": lambda o: o.land_parcel_name,
+        "subtitle": lambda o: _join(o.location, o.city),
+        "fields": ("land_parcel_name", "location", "city", "title"),
+    },
+}
+
+SEARCH_ENTITY_TYPES = tuple(source["type"] for source in SEARCH_SOURCES.values())
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally"""
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+def search_leads(query: Union[Query, Select], q: str, dialect_name: str) -> Tuple[Union[Query, Select], ColumnElement]:
+    """Filter leads matching q and return a relevance expression for ordering
+
+    The substring ILIKE predicates are served by the trigram indexes on
+    Postgres. Relevance uses pg_trgm word_similarity there; other databases
+    fall back to ranking prefix matches above plain substring matches.
+    """
+    term = escape_like(q)
+    query = query.filter(
+        or_(*[column.ilike(f"%{term}%", escape="/") for column in LEAD_SEARCH_COLUMNS])
+    )
+
+    if dialect_name == "postgresql":
+        rank = func.greatest(*[func.word_similarity(q, column) for column in LEAD_SEARCH_COLUMNS])
+    else:
+        rank = case(
+            (or_(*[column.ilike(f"{term}%", escape="/") for column in LEAD_SEARCH_COLUMNS]), 2),
+            else_=1
+        )
+    return query, rank
+
+def _entry_id(entity_type: str, entity_id: Any) -> str:
+    return f"{entity_type}:{entity_id}"
+
+def _entry_values(obj: Any, source: Dict[str, Any]) -> Dict[str, Any]:
+    values = [getattr(obj, field) for field in source["fields"]]
+    return {
+        "entity_type": source["type"],
+        "entity_id": str(obj.id),
+        "title": (source["title"](obj) or "")[:255],
+        "subtitle": (source["subtitle"](obj) or "")[:255] or None,
+        "search_text": _join(*[getattr(value, "value", value) for value in values]).lower(),
+        "owner_id": getattr(obj, "owner_id", None),
+        "assignee_id": getattr(obj, "assignee_id", None),
+    }
+
+def search_entry_rows(model: type, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """search_index rows for plain column dicts written with Core (no ORM events)"""
+    source = SEARCH_SOURCES[model]
+    return [
+        {"id": _entry_id(source["type"], row["id"]), **_entry_values(SimpleNamespace(**row), source)}
+        for row in rows
+    ]
+
+def index_entity(db: Session, obj: Any) -> None:
+    """Create or refresh the search_index row for an indexed model instance"""
+    source = SEARCH_SOURCES[type(obj)]
+    entry_id = _entry_id(source["type"], obj.id)
+    values = _entry_values(obj, source)
+
+    entry = db.get(SearchEntry, entry_id)
+    if entry is None:
+        db.add(SearchEntry(id=entry_id, **values))
+    else:
+        for field, value in values.items():
+            setattr(entry, field, value)
+
+def unindex_entity(db: Session, obj: Any) -> None:
+    """Remove the search_index row for an indexed model instance"""
+    source = SEARCH_SOURCES[type(obj)]
+    entry = db.get(SearchEntry, _entry_id(source["type"], obj.id))
+    if entry is not None:
+        db.delete(entry)
+
+@event.listens_for(Session, "before_flush")
+def _sync_search_index(session: Session, flush_context, instances) -> None:
+    """Keep search_index in step with ORM writes, inside the same transaction"""
+    for obj in list(session.new):
+        if type(obj) in SEARCH_SOURCES:
+            index_entity(session, obj)
+    for obj in list(session.dirty):
+        if type(obj) in SEARCH_SOURCES and session.is_modified(obj):
+            index_entity(session, obj)
+    for obj in list(session.deleted):
+        if type(obj) in SEARCH_SOURCES:
+            unindex_entity(session, obj)
+
+def rebuild_search_index(db: Session, batch_size: int = 1000) -> int:
+    """Rebuild search_index from scratch for every indexed model"""
+    db.query(SearchEntry).delete(synchronize_session=False)
+    indexed = 0
+    for model, source in SEARCH_SOURCES.items():
+        for obj in db.query(model).yield_per(batch_size):
+            db.add(SearchEntry(id=_entry_id(source["type"], obj.id), **_entry_values(obj, source)))
+            indexed += 1
+            if indexed % batch_size == 0:
+                db.flush()
+    db.commit()
+    return indexed
+
+def search_all(
+    db: Session,
+    q: str,
+    user: Employee,
+    entity_types: Optional[Sequence[str]] = None,
+    limit: int = 20
+) -> List[Dict[str, Any]]:
+    """Search every indexed module at once and return ranked, typed hits"""
+    term = escape_like(q.lower())
+    if db.get_bind().dialect.name == "postgresql":
+        rank = func.word_similarity(q.lower(), SearchEntry.search_text)
+    else:
+        rank = case((SearchEntry.title.ilike(f"{term}%", escape="/"), 2), else_=1)
+
+    query = db.query(SearchEntry, rank.label("score")).filter(
+        SearchEntry.search_text.like(f"%{term}%", escape="/")
+    )
+    if entity_types:
+        query = query.filter(SearchEntry.entity_type.in_(entity_types))
+
+    # Employees only see their own or assigned leads
+    if user.role.value != "admin":
+        query = query.filter(
+            or_(
+                SearchEntry.entity_type != "lead",
+                SearchEntry.owner_id == user.id,
+                SearchEntry.assignee_id == user.id
+            )
+        )
+
+    rows = query.order_by(rank.desc(), SearchEntry.id).limit(limit).all()
+    return [
+        {
+            "type": entry.entity_type,
+            "id": entry.entity_id,
+            "title": entry.title,
+            "subtitle": entry.subtitle,
+            "score": float(score)
+        }
+        for entry, score in rows
+    ]
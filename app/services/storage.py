@@ -0,0 +1,303 @@
+import asyncio
+import functools
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.security import create_signed_token
+from app.utils.errors import AppException
+from app.utils.logging import logger
+
+class StorageBackend:
+    """Async object storage used for uploaded documents"""
+
+    async def save(self, chunks: AsyncIterator[bytes], key: str, content_type: Optional[str] = None) -> Dict[str, str]:
+        """Store the streamed chunks under key and return its r2_key and public_url"""
+        raise NotImplementedError
+
+    async def delete(self, r2_key: str) -> bool:
+        raise NotImplementedError
+
+    async def read(self, r2_key: str) -> bytes:
+        """Whole object in memory; only for files already bounded by MAX_UPLOAD_SIZE_MB"""
+        raise NotImplementedError
+
+    async def download(self, r2_key: str, fileobj: BinaryIO) -> None:
+        """Copy an object of any size into a writable binary file, in bounded memory"""
+        raise NotImplementedError
+
+    async def size(self, r2_key: str) -> Optional[int]:
+        """Stored size in bytes, or None when the object does not exist"""
+        raise NotImplementedError
+
+    async def presign_upload(self, key: str, content_type: Optional[str], expires_in: int) -> Dict[str, Any]:
+        """URL the client uploads to directly: url, method, headers, r2_key, public_url"""
+        raise NotImplementedError
+
+    async def presign_download(self, r2_key: str, expires_in: int, filename: Optional[str] = None) -> str:
+        """Short-lived URL the client downloads the object from"""
+        raise NotImplementedError
+
+class LocalStorage(StorageBackend):
+    """Files under a local directory, served by the /uploads static mount"""
+
+    def __init__(
+        self,
+        root: str = "uploads",
+        url_prefix: str = "/uploads",
+        signed_url_prefix: str = "/api/v1/documents/local"
+    ):
+        self.root = root
+        self.url_prefix = url_prefix
+        self.signed_url_prefix = signed_url_prefix
+
+    def _path(self, key: str) -> str:
+        """Path for key, refusing any key that resolves outside root"""
+        root = os.path.abspath(self.root)
+        if not os.path.abspath(os.path.join(root, key)).startswith(root + os.sep):
+            raise AppException(code="INVALID_KEY", message="Invalid storage key", status_code=400)
+        return f"{self.root}/{key}"
+
+    async def save(self, chunks: AsyncIterator[bytes], key: str, content_type: Optional[str] = None) -> Dict[str, str]:
+        file_path = self._path(key)
+        partial_path = f"{file_path}.part"
+        await run_in_threadpool(os.makedirs, os.path.dirname(file_path), exist_ok=True)
+
+        # Disk writes run in the threadpool so a slow disk never stalls the loop
+        buffer = await run_in_threadpool(open, partial_path, "wb")
+        try:
+            try:
+                async for chunk in chunks:
+                    await run_in_threadpool(buffer.write, chunk)
+            finally:
+                await run_in_threadpool(buffer.close)
+            await run_in_threadpool(os.replace, partial_path, file_path)
+        finally:
+            # Aborted (too large, disconnected, failed) uploads leave nothing behind
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        return {"r2_key": file_path, "public_url": f"{self.url_prefix}/{key}"}
+
+    async def delete(self, r2_key: str) -> bool:
+        try:
+            await run_in_threadpool(os.remove, r2_key)
+            return True
+        except OSError:
+            return False
+
+    async def read(self, r2_key: str) -> bytes:
+        def read_file() -> bytes:
+            with open(r2_key, "rb") as f:
+                return f.read()
+        return await run_in_threadpool(read_file)
+
+    async def download(self, r2_key: str, fileobj: BinaryIO) -> None:
+        def copy_file() -> None:
+            with open(r2_key, "rb") as f:
+                shutil.copyfileobj(f, fileobj, settings.UPLOAD_CHUNK_SIZE)
+        await run_in_threadpool(copy_file)
+
+    async def size(self, r2_key: str) -> Optional[int]:
+        try:
+            return await run_in_threadpool(os.path.getsize, r2_key)
+        except OSError:
+            return None
+
+    async def presign_upload(self, key: str, content_type: Optional[str], expires_in: int) -> Dict[str, Any]:
+        # HMAC-signed URL to the API's local upload endpoint, the stand-in for a bucket
+        file_path = self._path(key)
+        token = create_signed_token({"key": key}, "local-upload", expires_in)
+        return {
+            "url": f"{self.signed_url_prefix}/upload?token={token}",
+            "method": "PUT",
+            "headers": {"Content-Type": content_type or "application/octet-stream"},
+            "r2_key": file_path,
+            "public_url": f"{self.url_prefix}/{key}"
+        }
+
+    async def presign_download(self, r2_key: str, expires_in: int, filename: Optional[str] = None) -> str:
+        token = create_signed_token({"r2_key": r2_key, "filename": filename}, "local-download", expires_in)
+        return f"{self.signed_url_prefix}/download?token={token}"
+
+class S3Storage(StorageBackend):
+    """AWS S3 or Cloudflare R2 via boto3, run on a dedicated thread pool
+
+    One client (and so one urllib3 connection pool of max_connections) is
+    shared by all requests; botocore applies the timeouts and retries.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        public_base_url: str,
+        max_connections: int,
+        **client_kwargs: Any
+    ):
+        self.bucket = bucket
+        self.public_base_url = public_base_url.rstrip("/")
+        self.max_connections = max_connections
+        self._client_kwargs = client_kwargs
+        self._client = None
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="storage")
+
+    @property
+    def client(self):
+        # Built on first use; importing boto3 costs ~150ms
+        if self._client is None:
+            import boto3
+            from botocore.config import Config
+
+            self._client = boto3.client(
+                "s3",
+                config=Config(
+                    max_pool_connections=self.max_connections,
+                    connect_timeout=settings.STORAGE_CONNECT_TIMEOUT,
+                    read_timeout=settings.STORAGE_READ_TIMEOUT,
+                    retries={"max_attempts": settings.STORAGE_MAX_ATTEMPTS, "mode": "standard"}
+                ),
+                **self._client_kwargs
+            )
+        return self._client
+
+    async def _call(self, method: str, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(getattr(self.client, method), **kwargs)
+        )
+
+    async def _abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        """Best effort: a failed abort is logged so the error that caused it still propagates"""
+        try:
+            await self._call("abort_multipart_upload", Bucket=self.bucket, Key=key, UploadId=upload_id)
+        except Exception:
+            logger.exception("Failed to abort multipart upload %s of %s", upload_id, key)
+
+    async def save(self, chunks: AsyncIterator[bytes], key: str, content_type: Optional[str] = None) -> Dict[str, str]:
+        from botocore.exceptions import ClientError
+
+        upload = await self._call(
+            "create_multipart_upload",
+            Bucket=self.bucket,
+            Key=key,
+            ContentType=content_type or "application/octet-stream"
+        )
+        parts = []
+        buffer = bytearray()
+
+        async def flush_part():
+            response = await self._call(
+                "upload_part",
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload["UploadId"],
+                PartNumber=len(parts) + 1,
+                Body=bytes(buffer)
+            )
+            parts.append({"PartNumber": len(parts) + 1, "ETag": response["ETag"]})
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                if len(buffer) >= settings.S3_MULTIPART_PART_SIZE:
+                    await flush_part()
+            # The last part may be smaller than the minimum part size (or empty)
+            if buffer or not parts:
+                await flush_part()
+
+            await self._call(
+                "complete_multipart_upload",
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload["UploadId"],
+                MultipartUpload={"Parts": parts}
+            )
+        except BaseException as e:
+            # Covers client disconnects and cancellation too, so no orphaned parts are left billed
+            await self._abort_multipart_upload(key, upload["UploadId"])
+            if isinstance(e, ClientError):
+                raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
+            raise
+
+        return {"r2_key": key, "public_url": f"{self.public_base_url}/{key}"}
+
+    async def delete(self, r2_key: str) -> bool:
+        try:
+            await self._call("delete_object", Bucket=self.bucket, Key=r2_key)
+            return True
+        except Exception:
+            return False
+
+    async def read(self, r2_key: str) -> bytes:
+        def read_object() -> bytes:
+            return self.client.get_object(Bucket=self.bucket, Key=r2_key)["Body"].read()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, read_object)
+
+    async def download(self, r2_key: str, fileobj: BinaryIO) -> None:
+        await self._call("download_fileobj", Bucket=self.bucket, Key=r2_key, Fileobj=fileobj)
+
+    async def size(self, r2_key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+
+        try:
+            head = await self._call("head_object", Bucket=self.bucket, Key=r2_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return head["ContentLength"]
+
+    async def presign_upload(self, key: str, content_type: Optional[str], expires_in: int) -> Dict[str, Any]:
+        content_type = content_type or "application/octet-stream"
+        url = await self._call(
+            "generate_presigned_url",
+            ClientMethod="put_object",
+            Params={"Bucket": self.bucket, "Key": key, "ContentType": content_type},
+            ExpiresIn=expires_in
+        )
+        return {
+            "url": url,
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+            "r2_key": key,
+            "public_url": f"{self.public_base_url}/{key}"
+        }
+
+    async def presign_download(self, r2_key: str, expires_in: int, filename: Optional[str] = None) -> str:
+        params = {"Bucket": self.bucket, "Key": r2_key}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+        return await self._call(
+            "generate_presigned_url",
+            ClientMethod="get_object",
+            Params=params,
+            ExpiresIn=expires_in
+        )
+
+def build_storage() -> StorageBackend:
+    """Pick the storage backend from settings: S3, then R2, then local disk"""
+    if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
+        return S3Storage(
+            bucket=settings.AWS_BUCKET_NAME,
+            public_base_url=f"https://{settings.AWS_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com",
+            max_connections=settings.STORAGE_MAX_CONNECTIONS,
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION
+        )
+    if settings.R2_ACCESS_KEY_ID and settings.R2_SECRET_ACCESS_KEY:
+        return S3Storage(
+            bucket=settings.R2_BUCKET,
+            public_base_url=f"{settings.R2_ENDPOINT}/{settings.R2_BUCKET}",
+            max_connections=settings.STORAGE_MAX_CONNECTIONS,
+            endpoint_url=settings.R2_ENDPOINT,
+            aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+            region_name="auto"
+        )
+    return LocalStorage()
@@ -0,0 +1,59 @@
+import os
+from sqlalchemy import update
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.process_pool import ProcessPool
+from app.models.document import Document
+from app.services.file_upload import FileUploadService, file_upload_service
+from app.utils.logging import logger
+from app.utils.thumbnails import THUMBNAIL_CONTENT_TYPES, render_thumbnail
+
+class ThumbnailService:
+    """Renders document thumbnails on a worker process pool, off the request path
+
+    Thumbnails are stored beside the original as <name>.thumb.jpg and shared
+    by every document pointing at the same stored file.
+    """
+
+    def __init__(self, uploads: FileUploadService, max_workers: int, max_edge: int):
+        self.uploads = uploads
+        self.max_edge = max_edge
+        self.pool = ProcessPool(max_workers)
+
+    def supports(self, document: Document) -> bool:
+        return self.pool.enabled and document.content_type in THUMBNAIL_CONTENT_TYPES
+
+    async def generate(self, document_id: str) -> None:
+        """Background task: render and store the thumbnail for a document"""
+        try:
+            async with AsyncSessionLocal() as db:
+                document = await db.get(Document, document_id)
+                if not document or document.thumbnail_url or not self.supports(document):
+                    return
+
+                data = await self.uploads.storage.read(document.r2_key)
+                thumbnail = await self.pool.run(render_thumbnail, data, document.content_type, self.max_edge)
+                if thumbnail is None:
+                    return
+
+                name = os.path.splitext(os.path.basename(document.r2_key))[0]
+                stored = await self.uploads.upload_bytes(
+                    thumbnail,
+                    f"{document.entity}/{document.entity_id}/{name}.thumb.jpg",
+                    "image/jpeg"
+                )
+                await db.execute(
+                    update(Document)
+                    .where(Document.r2_key == document.r2_key)
+                    .values(thumbnail_key=stored["r2_key"], thumbnail_url=stored["public_url"])
+                )
+                await db.commit()
+        except Exception as e:
+            # Best effort: the document itself is already saved
+            logger.warning(
+                "Thumbnail generation failed",
+                extra={"document_id": document_id, "error": str(e)}
+            )
+
+# Global instance
+thumbnail_service = ThumbnailService(file_upload_service, settings.THUMBNAIL_WORKERS, settings.THUMBNAIL_SIZE)
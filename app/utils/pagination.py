@@ -0,0 +1,233 @@
+import base64
+import binascii
+import enum
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.core.config import settings
+from app.core.database import Base
+from app.utils.errors import AppException
+
+def _sort_column(model: Type[Base], sort: Optional[str]):
+    """Return the column to sort on, falling back to the primary key"""
+    if sort and sort in model.__table__.columns:
+        return getattr(model, sort)
+    return model.id
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if issubclass(python_type, enum.Enum):
+        return python_type(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return value
+
+def encode_cursor(row: Base, model: Type[Base], sort: Optional[str]) -> str:
+    """Build an opaque cursor pointing just after the given row"""
+    column = _sort_column(model, sort)
+    data = [_encode_value(getattr(row, column.key)), str(row.id)]
+    raw = json.dumps(data, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, model: Type[Base], sort: Optional[str]) -> Tuple[Any, str]:
+    """Decode a cursor produced by encode_cursor into (sort value, id)"""
+    column = _sort_column(model, sort)
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, last_id = json.loads(raw)
+        return _decode_value(column, value), str(last_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise AppException(
+            code="INVALID_CURSOR",
+            message="Invalid pagination cursor",
+            status_code=400
+        )
+
+def apply_keyset_order(query: Union[Query, Select], model: Type[Base], sort: Optional[str], sort_order: str) -> Union[Query, Select]:
+    """Order by (sort column, id) so that every row has a stable position
+
+    NULLs sort last ascending and first descending (the Postgres default), so a
+    plain (column, id) index serves both directions.
+    """
+    column = _sort_column(model, sort)
+    if sort_order == "desc":
+        if column.key == "id":
+            return query.order_by(model.id.desc())
+        return query.order_by(column.desc().nullsfirst(), model.id.desc())
+    if column.key == "id":
+        return query.order_by(model.id.asc())
+    return query.order_by(column.asc().nullslast(), model.id.asc())
+
+def apply_cursor(query: Union[Query, Select], model: Type[Base], sort: Optional[str], sort_order: str, cursor: str) -> Union[Query, Select]:
+    """Restrict a query ordered by apply_keyset_order to rows after the cursor"""
+    column = _sort_column(model, sort)
+    value, last_id = decode_cursor(cursor, model, sort)
+
+    if column.key == "id":
+        if sort_order == "desc":
+            return query.filter(model.id < last_id)
+        return query.filter(model.id > last_id)
+
+    if sort_order == "desc":
+        # NULLs come first, so they are only left while still inside the NULL run
+        if value is None:
+            return query.filter(
+                or_(
+                    and_(column.is_(None), model.id < last_id),
+                    column.isnot(None)
+                )
+            )
+        return query.filter(tuple_(column, model.id) < (value, last_id))
+
+    # NULLs come last, so they follow every non-NULL value
+    if value is None:
+        return query.filter(and_(column.is_(None), model.id > last_id))
+    return query.filter(
+        or_(
+            tuple_(column, model.id) > (value, last_id),
+            column.is_(None)
+        )
+    )
+
+def fetch_keyset_page(
+    query: Query,
+    model: Type[Base],
+    sort: Optional[str],
+    sort_order: str,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page and the cursor for the next one (None on the last page)"""
+    if cursor:
+        query = apply_cursor(query, model, sort, sort_order, cursor)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1], model, sort) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+async def fetch_keyset_page_async(
+    db: AsyncSession,
+    statement: Select,
+    model: Type[Base],
+    sort: Optional[str],
+    sort_order: str,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """AsyncSession counterpart of fetch_keyset_page for select() statements"""
+    if cursor:
+        statement = apply_cursor(statement, model, sort, sort_order, cursor)
+
+    rows = (await db.execute(statement.limit(limit + 1))).scalars().all()
+    next_cursor = encode_cursor(rows[limit - 1], model, sort) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper so the planner sees the statement with its typed binds"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+# Short-lived exact counts keyed by compiled statement (i.e. by filter set)
+_count_cache: Dict[str, Tuple[float, int]] = {}
+_COUNT_CACHE_MAX_ENTRIES = 1024
+
+async def _exact_count(db: AsyncSession, statement: Select) -> int:
+    count_statement = select(func.count()).select_from(statement.order_by(None).subquery())
+    return (await db.execute(count_statement)).scalar_one()
+
+async def _planner_estimate(db: AsyncSession, statement: Select) -> int:
+    plan = (await db.execute(_Explain(statement))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+async def _cached_count(db: AsyncSession, statement: Select) -> Tuple[int, str]:
+    compiled = statement.compile(dialect=db.get_bind().dialect)
+    key = f"{compiled}|{sorted(compiled.params.items(), key=lambda item: item[0])!r}"
+    now = time.monotonic()
+
+    cached = _count_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1], "cached"
+
+    total = await _exact_count(db, statement)
+    if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+        # Drop expired entries first, then the oldest if still full
+        for stale_key in [k for k, (expires, _) in _count_cache.items() if expires <= now]:
+            del _count_cache[stale_key]
+        if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+            del _count_cache[next(iter(_count_cache))]
+    _count_cache[key] = (now + settings.COUNT_CACHE_TTL_SECONDS, total)
+    return total, "exact"
+
+async def count_total(db: AsyncSession, statement: Select, mode: str = "exact") -> Tuple[Optional[int], str]:
+    """Count a filtered select() according to mode (exact|estimate|none)
+
+    Returns the total and its kind: "exact", "estimate" (Postgres planner
+    row estimate), "cached" (an exact count from the last few seconds) or
+    "none" when counting was skipped.
+    """
+    if mode == "none":
+        return None, "none"
+    if mode == "estimate":
+        if db.get_bind().dialect.name == "postgresql":
+            return await _planner_estimate(db, statement), "estimate"
+        return await _cached_count(db, statement)
+    return await _exact_count(db, statement), "exact"
+
+def page_meta(
+    total: Optional[int],
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    next_cursor: Optional[str],
+    total_kind: str = "exact"
+) -> Dict[str, Any]:
+    """Build list metadata for offset (page) or keyset (cursor) pagination"""
+    if cursor is not None:
+        return {
+            "total": total,
+            "total_kind": total_kind,
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        }
+    return {
+        "total": total,
+        "total_kind": total_kind,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+        "next_cursor": next_cursor
+    }
@@ -0,0 +1,47 @@
+import io
+from typing import Optional
+
+# Content types render_thumbnail can draw; PDFs are drawn from their first page
+THUMBNAIL_CONTENT_TYPES = (
+    "application/pdf",
+    "image/jpeg",
+    "image/png",
+    "image/gif",
+    "image/webp",
+    "image/bmp",
+    "image/tiff",
+)
+
+def render_thumbnail(data: bytes, content_type: str, max_edge: int) -> Optional[bytes]:
+    """JPEG thumbnail at most max_edge px on its longest side, or None for unsupported types
+
+    CPU-bound; meant to run in a worker process, so this module keeps no app imports.
+    """
+    if content_type not in THUMBNAIL_CONTENT_TYPES:
+        return None
+
+    from PIL import Image, ImageOps
+
+    if content_type == "application/pdf":
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(data)
+        try:
+            page = pdf[0]
+            width, height = page.get_size()
+            # Render straight at thumbnail scale instead of full size
+            image = page.render(scale=max_edge / max(width, height)).to_pil()
+        finally:
+            pdf.close()
+    else:
+        image = Image.open(io.BytesIO(data))
+        # Let the JPEG decoder downscale while decoding
+        image.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(image)
+
+    image.thumbnail((max_edge, max_edge))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=80, optimize=True)
+    return buffer.getvalue()
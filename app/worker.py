@@ -0,0 +1,72 @@
+"""Background job worker: `python -m app.worker`
+
+Starts JOB_WORKERS processes, each claiming and running queued jobs, and
+restarts any that exit unexpectedly. SIGINT/SIGTERM let running jobs finish
+before the processes exit.
+"""
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from app.core.config import settings
+from app.utils.logging import setup_logging, logger
+
+async def _serve() -> None:
+    from app.core.database import async_engine
+    from app.services.bulk_import import validation_pool
+    from app.services.jobs import JobWorker
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    worker = JobWorker(f"{socket.gethostname()}:{os.getpid()}")
+    logger.info("Job worker started", extra={"worker_id": worker.worker_id})
+    try:
+        await worker.work(stop)
+    finally:
+        validation_pool.shutdown()
+        await async_engine.dispose()
+
+def run_worker() -> None:
+    """Entry point of one worker process"""
+    setup_logging()
+    asyncio.run(_serve())
+
+def main() -> None:
+    setup_logging()
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    stopping = False
+
+    def start(index: int) -> multiprocessing.Process:
+        process = context.Process(target=run_worker, name=f"job-worker-{index}")
+        process.start()
+        return process
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    processes.extend(start(index) for index in range(max(settings.JOB_WORKERS, 1)))
+    while not stopping:
+        for index, process in enumerate(processes):
+            if not process.is_alive() and not stopping:
+                logger.warning("Job worker exited, restarting", extra={"exitcode": process.exitcode})
+                processes[index] = start(index)
+        time.sleep(1)
+
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.api.v1.api import api_router
+from app.api.v1.api import LazyAPIApp
 from app.core.config import settings
-from app.core.database import engine
-from app.models import Base
+from app.core.database import async_engine
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.schema import prepare_schema
+from app.services.bulk_import import validation_pool
+from app.services.thumbnails import thumbnail_service
 import os
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await prepare_schema(async_engine)
+    yield
+    thumbnail_service.pool.shutdown()
+    validation_pool.shutdown()
+    await async_engine.dispose()
+
+
+# The /api/v1 routes are registered on startup or first request, keeping imports cheap
+app = LazyAPIApp(
     title="Construction CRM API",
     description="A comprehensive CRM system for construction and real estate management",
     version="1.0.0",
-    docs_url="/docs" if settings.debug else None,
-    redoc_url="/redoc" if settings.debug else None,
+    docs_url="/docs" if settings.DEBUG else None,
+    redoc_url="/redoc" if settings.DEBUG else None,
+    lifespan=lifespan,
 )
 
+# Per-user API rate limit (registered before CORS so 429s still carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -25,23 +41,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Mount static files for local file uploads
-if not settings.aws_access_key_id:
+if not settings.AWS_ACCESS_KEY_ID:
     os.makedirs("uploads", exist_ok=True)
     app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
-# Include API routes
-app.include_router(api_router, prefix="/api/v1")
-
-
 @app.get("/")
 def read_root():
     return {
         "message": "Construction CRM API",
         "version": "1.0.0",
-        "docs": "/docs" if settings.debug else "Documentation disabled in production"
+        "docs": "/docs" if settings.DEBUG else "Documentation disabled in production"
     }
 
 
@@ -56,5 +69,5 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.debug
+        reload=settings.DEBUG
     )
\ No newline at end of file
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Fail if importing the API pulls in heavy modules that should only load on
+first use, or exceeds a startup-time budget when one is given
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded lazily by the storage and security helpers, and by LazyAPIApp for the endpoints
+DEFERRED_MODULES = ("boto3", "botocore", "jose", "passlib", "app.api.v1.endpoints")
+
+# Wall-clock time depends on the machine, so the budget is opt-in; a cold
+# import of app.main measures about 0.7 s here
+BUDGET_MS = int(os.environ["IMPORT_TIME_BUDGET_MS"]) if os.getenv("IMPORT_TIME_BUDGET_MS") else None
+
+IMPORT_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(module: str):
+    """Return (cumulative microseconds, imported module names) for one cold import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"❌ Importing {module} failed:\n{result.stderr}")
+
+    total, imported = 0, []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            imported.append(match.group(3))
+            if match.group(3) == module:
+                total = int(match.group(1))
+    return total, imported
+
+
+def eager_deferred_modules(imported):
+    """Modules from DEFERRED_MODULES, or their submodules, that were imported anyway"""
+    return sorted({
+        name for name in imported
+        if any(name == deferred or name.startswith(f"{deferred}.") for deferred in DEFERRED_MODULES)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=int, default=BUDGET_MS, help="defaults to IMPORT_TIME_BUDGET_MS; unset skips the timing check")
+    args = parser.parse_args()
+
+    total_us, imported = measure(args.module)
+    eager = eager_deferred_modules(imported)
+    budget = f"budget {args.budget_ms} ms" if args.budget_ms is not None else "no budget"
+    print(f"import {args.module}: {total_us / 1000:.0f} ms ({budget})")
+
+    failed = False
+    if eager:
+        print(f"❌ Deferred modules imported at startup: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and total_us / 1000 > args.budget_ms:
+        print("❌ Import time over budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Startup imports deferred" + (" and within budget" if args.budget_ms is not None else ""))
+
+
+if __name__ == "__main__":
+    main()
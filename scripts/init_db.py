@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from sqlalchemy.orm import Session
 from app.core.database import engine, SessionLocal
+from app.core.schema import resolve_schema_mode
 from app.core.security import get_password_hash
 from app.models import Base, User
 from app.models.user import UserRole, UserStatus
@@ -16,8 +17,9 @@ import uuid
 
 def init_db():
     """Initialize database with sample data"""
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # Create all tables (SQLite only; otherwise apply supabase/migrations)
+    if resolve_schema_mode() == "create":
+        Base.metadata.create_all(bind=engine)
     
     db = SessionLocal()
     
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Hit one API endpoint with concurrent authenticated requests and report
+throughput and latency, to compare builds or database setups
+
+Start the API with RATE_LIMIT_API=0, or the per-user limit caps the rate.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post("/api/v1/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def worker(client: httpx.AsyncClient, path: str, deadline: float, latencies: list, failures: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+        except httpx.HTTPError as e:
+            failures.append(type(e).__name__)
+            continue
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            failures.append(str(response.status_code))
+
+
+def percentile(values: list, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        token = args.token or await login(client, args.username, args.password)
+        # The API reads the token from its auth cookie, which login marks Secure
+        client.headers["Cookie"] = f"auth_token={token}"
+
+        # One untimed request per connection so connection setup stays out of the numbers
+        await asyncio.gather(*(client.get(args.path) for _ in range(args.concurrency)))
+
+        latencies, failures = [], []
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            worker(client, args.path, deadline, latencies, failures) for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        raise SystemExit(f"❌ No successful requests ({len(failures)} failed: {sorted(set(failures))})")
+
+    latencies.sort()
+    print(f"{args.path} with {args.concurrency} concurrent clients for {elapsed:.1f}s")
+    print(f"  requests/s: {len(latencies) / elapsed:.1f}")
+    print(f"  latency ms: mean {statistics.mean(latencies) * 1000:.1f}, "
+          f"p50 {percentile(latencies, 0.50) * 1000:.1f}, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f}, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f}")
+    if failures:
+        print(f"  failed: {len(failures)} ({', '.join(sorted(set(failures)))})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/v1/leads/?page_size=50", help="GET endpoint to load")
+    parser.add_argument("--username", default="boss")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--token", help="auth_token to use instead of logging in")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per request")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
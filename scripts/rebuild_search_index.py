@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Rebuild the global search index from the indexed tables
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.database import SessionLocal
+from app.services.search_service import rebuild_search_index
+
+
+def main():
+    """Repopulate search_index; ORM writes keep it current afterwards"""
+    db = SessionLocal()
+    
+    try:
+        indexed = rebuild_search_index(db)
+        print(f"✅ Search index rebuilt: {indexed} entries")
+    except Exception as e:
+        print(f"❌ Error rebuilding search index: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from sqlalchemy.orm import Session
 from app.core.database import engine, SessionLocal
+from app.core.password_pool import password_pool
+from app.core.schema import resolve_schema_mode
 from app.core.security import get_password_hash
 from app.models import Base, User
 from app.models.user import UserRole, UserStatus
@@ -15,8 +17,9 @@ import uuid
 
 def seed_users():
     """Seed database with hardcoded users"""
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # Create all tables (SQLite only; otherwise apply supabase/migrations)
+    if resolve_schema_mode() == "create":
+        Base.metadata.create_all(bind=engine)
     
     db = SessionLocal()
     
@@ -73,24 +76,32 @@ def seed_users():
             }
         ]
         
+        new_users = []
         for user_data in users_data:
             # Check if user already exists
             existing_user = db.query(User).filter(User.username == user_data["username"]).first()
             
             if not existing_user:
-                # Create new user
-                password = user_data.pop("password")
-                user = User(
-                    id=str(uuid.uuid4()),
-                    password=get_password_hash(password),
-                    status=UserStatus.ACTIVE,
-                    **user_data
-                )
-                db.add(user)
-                print(f"✅ Created user: {user_data['username']}")
+                new_users.append(user_data)
             else:
                 print(f"⚠️  User already exists: {user_data['username']}")
         
+        # Hash in parallel on the bcrypt pool
+        hashed_passwords = password_pool.map_sync(
+            get_password_hash, [user_data.pop("password") for user_data in new_users]
+        )
+        
+        for user_data, hashed_password in zip(new_users, hashed_passwords):
+            # Create new user
+            user = User(
+                id=str(uuid.uuid4()),
+                password=hashed_password,
+                status=UserStatus.ACTIVE,
+                **user_data
+            )
+            db.add(user)
+            print(f"✅ Created user: {user_data['username']}")
+        
         db.commit()
         print("\n✅ Database seeded successfully!")
         print("Login credentials:")
@@ -31,6 +31,7 @@ interface DataTableProps {
     page: number;
     page_size: number;
     total_pages: number;
+    total_kind?: 'exact' | 'estimate' | 'cached' | 'none';
   };
   onPageChange?: (page: number) => void;
 }
@@ -55,6 +56,7 @@ const DataTable: React.FC<DataTableProps> = ({
   const [currentPage, setCurrentPage] = useState(1);
 
   const isServerPaginated = !!meta;
+  const totalPrefix = meta?.total_kind === 'estimate' ? 'about ' : '';
   const itemsPerPage = meta ? meta.page_size : 10;
   const effectiveCurrentPage = meta ? meta.page : currentPage;
   const startIndex = (effectiveCurrentPage - 1) * itemsPerPage;
@@ -117,7 +119,7 @@ const DataTable: React.FC<DataTableProps> = ({
           <div>
             {title && <h3 className="text-lg font-medium text-gray-900">{title}</h3>}
             <p className="text-sm text-gray-500">
-              Showing {paginatedData.length} of {isServerPaginated ? meta.total : filteredData.length} results
+              Showing {paginatedData.length} of {isServerPaginated ? `${totalPrefix}${meta.total}` : filteredData.length} results
             </p>
           </div>
           
@@ -245,7 +247,7 @@ const DataTable: React.FC<DataTableProps> = ({
             <div className="text-sm text-gray-700">
               {meta && (
                 <span>
-                  Showing {((meta.page - 1) * meta.page_size) + 1} to {Math.min(meta.page * meta.page_size, meta.total)} of {meta.total} results
+                  Showing {((meta.page - 1) * meta.page_size) + 1} to {Math.min(meta.page * meta.page_size, meta.total)} of {totalPrefix}{meta.total} results
                 </span>
               )}
             </div>
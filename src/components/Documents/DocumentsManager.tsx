@@ -126,7 +126,16 @@ const DocumentsManager: React.FC<DocumentsManagerProps> = ({ entity, entityId, t
               <div key={doc.id} className="p-4 hover:bg-gray-50">
                 <div className="flex items-center justify-between">
                   <div className="flex items-center space-x-3">
-                    {getFileIcon(doc.content_type)}
+                    {doc.thumbnail_url ? (
+                      <img
+                        src={doc.thumbnail_url}
+                        alt=""
+                        loading="lazy"
+                        className="h-10 w-10 rounded object-cover border border-gray-200"
+                      />
+                    ) : (
+                      getFileIcon(doc.content_type)
+                    )}
                     <div>
                       <p className="text-sm font-medium text-gray-900">{doc.filename}</p>
                       <p className="text-xs text-gray-500">
@@ -297,8 +297,8 @@ const LeadsManager: React.FC = () => {
 
   const handleExport = useCallback(async () => {
     try {
-      const queryParams = new URLSearchParams({ ...filters, format: 'csv' });
-      const response = await fetch(`${API_BASE}/api/v1/leads?${queryParams}`, {
+      const queryParams = new URLSearchParams(filters);
+      const response = await fetch(`${API_BASE}/api/v1/leads/export?${queryParams}`, {
         credentials: 'include'
       });
       
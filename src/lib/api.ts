@@ -8,6 +8,8 @@ export interface ApiResponse<T = any> {
     page: number;
     page_size: number;
     total_pages: number;
+    total_kind?: 'exact' | 'estimate' | 'cached' | 'none';
+    next_cursor?: string | null;
   };
   error?: {
     code: string;
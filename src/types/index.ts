@@ -81,6 +81,7 @@ export interface Document {
   file_size: number;
   r2_key: string;
   public_url?: string;
+  thumbnail_url?: string;
   uploaded_by: string;
   uploaded_by_name?: string;
   created_at: string;
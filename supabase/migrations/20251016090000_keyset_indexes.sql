@@ -0,0 +1,16 @@
+/*
+  # Keyset Pagination Indexes
+
+  List endpoints accept an opaque `cursor` and page on (created_at, id)
+  instead of OFFSET. These composite indexes let each page start with an
+  index seek, so deep pages cost the same as the first one. A plain
+  ascending index serves both sort directions.
+*/
+
+CREATE INDEX IF NOT EXISTS idx_leads_created_at_id ON leads(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_pending_actions_created_at_id ON pending_actions(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_developers_created_at_id ON developers(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_contacts_created_at_id ON contacts(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_projects_created_at_id ON projects(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_inventory_created_at_id ON inventory(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_land_created_at_id ON land_parcels(created_at, id);
@@ -0,0 +1,19 @@
+/*
+  # Trigram Search Indexes for Leads
+
+  The leads `q` filter matches `ILIKE '%term%'` against client_company,
+  contact_person, email and inquiry_no. A leading wildcard cannot use a
+  B-tree index, so every search was a sequential scan.
+
+  pg_trgm GIN indexes serve substring ILIKE directly (terms of 3+
+  characters), and Postgres combines the four with a BitmapOr. The same
+  extension provides word_similarity(), used to rank results when the
+  list is sorted by relevance.
+*/
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_leads_client_company_trgm ON leads USING gin (client_company gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_leads_contact_person_trgm ON leads USING gin (contact_person gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_leads_email_trgm ON leads USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_leads_inquiry_no_trgm ON leads USING gin (inquiry_no gin_trgm_ops);
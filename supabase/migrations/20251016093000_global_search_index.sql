@@ -0,0 +1,31 @@
+/*
+  # Global Search Index
+
+  Denormalized table behind `/api/v1/search`. It holds one row per lead,
+  contact, developer, inventory item, project and land parcel. The API
+  keeps it current in the same transaction as each ORM write.
+
+  `search_text` is the lowercased concatenation of each record's
+  searchable fields. A pg_trgm GIN index serves the substring match and
+  word_similarity ranking. `owner_id`/`assignee_id` carry lead visibility
+  for employees.
+
+  Populate existing data once with `python scripts/rebuild_search_index.py`.
+*/
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS search_index (
+  id TEXT PRIMARY KEY,
+  entity_type VARCHAR(50) NOT NULL,
+  entity_id TEXT NOT NULL,
+  title VARCHAR(255),
+  subtitle VARCHAR(255),
+  search_text TEXT NOT NULL,
+  owner_id TEXT,
+  assignee_id TEXT,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_index_entity ON search_index(entity_type, entity_id);
+CREATE INDEX IF NOT EXISTS idx_search_index_text_trgm ON search_index USING gin (search_text gin_trgm_ops);
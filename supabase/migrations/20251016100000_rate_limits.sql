@@ -0,0 +1,22 @@
+/*
+  # Shared Rate Limit Counters
+
+  Fixed-window request counters used when RATE_LIMIT_BACKEND=postgres.
+  Every API worker increments the same row per (key, window) with an
+  UPSERT, so limits hold across workers and hosts. Keys look like
+  `api:user:<id>`, `api:ip:<addr>` or `login:<addr>`. `window_start` is
+  the window's start in epoch seconds.
+
+  The table is UNLOGGED: counters are short-lived and losing them on a
+  crash only resets the current window. Workers delete expired windows
+  as they go.
+*/
+
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limits (
+  key TEXT NOT NULL,
+  window_start BIGINT NOT NULL,
+  hits INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (key, window_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limits_window_start ON rate_limits(window_start);
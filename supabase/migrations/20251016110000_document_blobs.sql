@@ -0,0 +1,25 @@
+/*
+  # Content-Addressed Document Storage
+
+  Uploaded files are stored once per distinct content. `document_blobs`
+  has one row per SHA-256 with the stored object's key and a count of the
+  documents that reference it. `documents.sha256` points at the blob; the
+  object is deleted from storage when its last document is deleted.
+
+  Existing documents and presigned uploads keep `sha256` NULL and own
+  their object outright, as before.
+*/
+
+CREATE TABLE IF NOT EXISTS document_blobs (
+  sha256 VARCHAR(64) PRIMARY KEY,
+  r2_key VARCHAR(255) NOT NULL,
+  public_url VARCHAR(255),
+  size INTEGER NOT NULL,
+  content_type VARCHAR(100),
+  ref_count INTEGER NOT NULL DEFAULT 1,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS sha256 VARCHAR(64) REFERENCES document_blobs(sha256);
+
+CREATE INDEX IF NOT EXISTS idx_documents_sha256 ON documents(sha256);
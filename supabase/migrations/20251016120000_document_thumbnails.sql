@@ -0,0 +1,13 @@
+/*
+  # Document Thumbnails
+
+  Small JPEG thumbnails for image and PDF documents, rendered by a
+  background job after upload and stored beside the original file. The
+  document list shows these instead of downloading each file.
+  Documents that share a stored file (same `sha256`) share its thumbnail.
+  Both columns stay NULL until the job finishes, and for file types
+  without a thumbnail.
+*/
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS thumbnail_key VARCHAR(255);
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS thumbnail_url VARCHAR(255);
@@ -0,0 +1,33 @@
+/*
+  # Background Jobs
+
+  Long-running imports and exports are queued in `jobs` and run by
+  `python -m app.worker`. Workers claim queued rows with
+  SELECT ... FOR UPDATE SKIP LOCKED and keep `heartbeat_at` fresh while
+  running; a running job whose heartbeat goes stale is claimed again, up
+  to JOB_MAX_ATTEMPTS runs.
+*/
+
+CREATE TABLE IF NOT EXISTS jobs (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  kind VARCHAR(50) NOT NULL,
+  status VARCHAR(20) NOT NULL DEFAULT 'queued' CHECK (status IN ('queued','running','succeeded','failed')),
+  params JSONB,
+  input_key VARCHAR(255),
+  progress JSONB,
+  result JSONB,
+  error TEXT,
+  artifact_key VARCHAR(255),
+  artifact_filename VARCHAR(255),
+  attempts INTEGER NOT NULL DEFAULT 0,
+  worker_id VARCHAR(100),
+  created_by UUID NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  started_at TIMESTAMP WITH TIME ZONE,
+  heartbeat_at TIMESTAMP WITH TIME ZONE,
+  finished_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Claim order for workers; finished jobs drop out of the index
+CREATE INDEX IF NOT EXISTS idx_jobs_claimable ON jobs(created_at) WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_jobs_created_by ON jobs(created_by, created_at DESC);
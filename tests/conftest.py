@@ -0,0 +1,35 @@
+import os
+import tempfile
+
+# The engines are built when app.core.database is imported, so point them at
+# a scratch SQLite file before any test module imports the app
+_DB_DIR = tempfile.mkdtemp(prefix="crm-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["DEBUG"] = "false"
+
+import pytest
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+@pytest.fixture
+def db_schema():
+    """Fresh tables for one test"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def sync_db(db_schema):
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture
+async def async_db(db_schema):
+    async with AsyncSessionLocal() as db:
+        yield db
+    # Pooled aiosqlite connections belong to this test's event loop
+    await async_engine.dispose()
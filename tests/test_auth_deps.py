@@ -0,0 +1,51 @@
+import uuid
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.api.deps import require_auth
+from app.core.database import async_engine, engine, get_db
+from app.core.security import create_access_token
+from app.models.employee import Employee
+from app.services.principal_cache import principal_cache
+
+async def test_sync_endpoint_holds_one_connection_while_authenticated(sync_db, async_db):
+    employee_id = str(uuid.uuid4())
+    sync_db.add(Employee(id=employee_id, username="owner", password_hash="x", name="Owner"))
+    sync_db.commit()
+    sync_db.close()
+    principal_cache.clear()
+
+    open_connections, peak = 0, 0
+
+    def checkout(*args):
+        nonlocal open_connections, peak
+        open_connections += 1
+        peak = max(peak, open_connections)
+
+    def checkin(*args):
+        nonlocal open_connections
+        open_connections -= 1
+
+    app = FastAPI()
+
+    @app.get("/probe")
+    def probe(db: Session = Depends(get_db), user: Employee = Depends(require_auth)):
+        db.get(Employee, user.id)
+        return {"user": user.id}
+
+    pools = (engine.pool, async_engine.sync_engine.pool)
+    for pool in pools:
+        event.listen(pool, "checkout", checkout)
+        event.listen(pool, "checkin", checkin)
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            client.cookies["auth_token"] = create_access_token({"sub": employee_id})
+            response = await client.get("/probe")
+    finally:
+        for pool in pools:
+            event.remove(pool, "checkout", checkout)
+            event.remove(pool, "checkin", checkin)
+
+    assert response.json() == {"user": employee_id}
+    assert peak == 1
@@ -0,0 +1,109 @@
+import csv
+import io
+import uuid
+from datetime import date
+import pytest
+from sqlalchemy import func, select
+from app.models.lead import Lead
+from app.models.search_entry import SearchEntry
+from app.schemas.lead import LeadCreate
+from app.core.config import settings
+from app.services.bulk_import import BulkInserter, import_csv
+from app.services.csv_service import open_csv_reader
+
+def _lead(inquiry_no, **values):
+    """A row shaped like the leads import produces: validated LeadCreate values plus an id"""
+    row = LeadCreate(
+        inquiry_no=inquiry_no,
+        inquiry_date=date(2025, 1, 1),
+        client_company=f"Company {inquiry_no}",
+        contact_person="Contact",
+        contact_no="9876543210",
+        space_requirement="5000 sqft",
+        city="Pune"
+    ).model_dump()
+    row.update(id=str(uuid.uuid4()), **values)
+    return row
+
+def _rows(inquiry_nos):
+    """(row_number, values) pairs numbered like iter_row_chunks does, from 1"""
+    return [(number, _lead(inquiry_no)) for number, inquiry_no in enumerate(inquiry_nos, start=1)]
+
+async def _stored(db):
+    inquiry_nos = (await db.execute(select(Lead.inquiry_no))).scalars().all()
+    entries = (await db.execute(select(func.count()).select_from(SearchEntry))).scalar_one()
+    return sorted(inquiry_nos), entries
+
+@pytest.mark.parametrize("batch_size", [1, 3, 4, 10, 25])
+async def test_every_row_inserted_once_across_batches(async_db, batch_size):
+    inquiry_nos = [f"INQ-{n:02}" for n in range(10)]
+    inserter = BulkInserter(async_db, Lead, "inquiry_no", batch_size, max_errors=100)
+
+    await inserter.write(_rows(inquiry_nos))
+
+    assert inserter.created == 10
+    assert inserter.error_count == 0
+    assert await _stored(async_db) == (inquiry_nos, 10)
+
+async def test_duplicates_and_existing_rows_are_skipped_and_counted(async_db):
+    async_db.add(Lead(**_lead("INQ-02")))
+    await async_db.commit()
+    # Rows 1-3, 4-6, 7-9, 10: INQ-04 repeats inside the second batch, INQ-06 in the next one
+    inquiry_nos = ["INQ-00", "INQ-01", "INQ-02", "INQ-03", "INQ-04", "INQ-04", "INQ-05", "INQ-06", "INQ-07", "INQ-06"]
+    inserter = BulkInserter(async_db, Lead, "inquiry_no", 3, max_errors=100)
+
+    await inserter.write(_rows(inquiry_nos))
+
+    assert inserter.created == 7
+    assert inserter.error_count == 3
+    assert sorted(inserter.errors) == [
+        "Row 10: inquiry_no INQ-06 already exists",
+        "Row 3: inquiry_no INQ-02 already exists",
+        "Row 6: inquiry_no INQ-04 is duplicated in the file",
+    ]
+    # Each lead stored once, with one search entry: the ORM indexed INQ-02, the bulk path the rest
+    assert await _stored(async_db) == ([f"INQ-{n:02}" for n in range(8)], 8)
+
+async def test_rejected_batch_falls_back_to_single_rows(async_db):
+    rows = _rows(["INQ-00", "INQ-01", "INQ-02"])
+    rows[1][1]["city"] = None
+    inserter = BulkInserter(async_db, Lead, "inquiry_no", 3, max_errors=100)
+
+    await inserter.write(rows)
+
+    assert inserter.created == 2
+    assert inserter.error_count == 1
+    assert inserter.errors[0].startswith("Row 2: ")
+    assert await _stored(async_db) == (["INQ-00", "INQ-02"], 2)
+
+async def test_error_messages_capped_but_all_counted(async_db):
+    inserter = BulkInserter(async_db, Lead, "inquiry_no", 10, max_errors=2)
+
+    await inserter.write(_rows(["INQ-00"] * 5))
+
+    assert inserter.created == 1
+    assert inserter.error_count == 4
+    assert len(inserter.errors) == 2
+
+async def test_rows_before_an_unreadable_line_are_imported(async_db, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_ROWS", 1000)
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=list(LeadCreate.model_fields))
+    writer.writeheader()
+    for n in range(300):
+        writer.writerow({k: v for k, v in _lead(f"INQ-{n:03}").items() if k in LeadCreate.model_fields})
+    # Not UTF-8, well past the decoder's first read, inside the first chunk
+    data = text.getvalue().encode() + b"INQ-\xff,2025-01-01\n"
+    inserter = BulkInserter(async_db, Lead, "inquiry_no", 100, max_errors=100)
+
+    reader = open_csv_reader(io.BytesIO(data))
+
+    events = [event async for event in import_csv(reader, LeadCreate, inserter, lambda row: {**row, "id": str(uuid.uuid4())})]
+
+    created = events[-1]["created"]
+    errors = events[-1]["errors"]
+    assert created > 0
+    assert len(errors) == 1
+    assert errors[0].startswith(f"Rows {created + 1} onward were not imported: could not read the file")
+    inquiry_nos, _ = await _stored(async_db)
+    assert inquiry_nos == [f"INQ-{n:03}" for n in range(created)]
@@ -0,0 +1,45 @@
+import csv
+from itertools import cycle, islice
+from pathlib import Path
+import pytest
+from app.schemas.lead import LeadCreate
+from app.services.columnar_validation import BATCH_ROWS, columnar_validator
+from app.services.csv_service import _validate_row, _validation_error, validate_rows
+
+FIXTURE = Path(__file__).parent / "fixtures" / "leads_import.csv"
+
+def _read_rows():
+    with open(FIXTURE, newline="", encoding="utf-8") as f:
+        return list(enumerate(csv.DictReader(f), 1))
+
+def _validate_each(model_class, rows):
+    """The plain per-row path: one Pydantic model per row, as before the columnar fast path"""
+    valid_rows, errors = [], []
+    for i, row in rows:
+        try:
+            valid_rows.append((i, _validate_row(model_class, row)))
+        except Exception as e:
+            errors.append(_validation_error(i, e))
+    return valid_rows, errors
+
+def test_lead_schema_uses_the_columnar_path():
+    assert columnar_validator(LeadCreate) is not None
+
+def test_fixture_has_valid_and_invalid_rows():
+    valid_rows, errors = _validate_each(LeadCreate, _read_rows())
+
+    assert len(valid_rows) >= 5
+    assert len(errors) >= 10
+
+def test_columnar_matches_per_row_validation():
+    rows = _read_rows()
+
+    assert validate_rows(LeadCreate, rows) == _validate_each(LeadCreate, rows)
+
+@pytest.mark.parametrize("size", [BATCH_ROWS - 1, BATCH_ROWS * 2 + 7])
+def test_columnar_matches_per_row_validation_across_batches(size):
+    # The fixture repeated past batch boundaries, with values recurring within a chunk
+    fixture = [row for _, row in _read_rows()]
+    rows = list(enumerate(islice(cycle(fixture), size), 1))
+
+    assert validate_rows(LeadCreate, rows) == _validate_each(LeadCreate, rows)
@@ -0,0 +1,38 @@
+import uuid
+import pytest
+from httpx import AsyncClient
+from app.api.deps import require_auth
+from app.main import app
+from app.models.employee import Employee, UserRole
+
+EXPORTS = [
+    "/api/v1/contacts/export",
+    "/api/v1/developers/export",
+    "/api/v1/inventory/export",
+    "/api/v1/land/export",
+    "/api/v1/projects/export",
+    "/api/v1/leads/export",
+]
+
+@pytest.fixture
+async def client(async_db):
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+@pytest.mark.parametrize("path", EXPORTS)
+async def test_export_requires_authentication(client, path):
+    response = await client.get(path)
+
+    assert response.status_code == 401
+    assert response.json()["error"]["code"] == "UNAUTHORIZED"
+
+@pytest.mark.parametrize("path", EXPORTS)
+async def test_export_streams_csv_when_authenticated(client, path):
+    app.dependency_overrides[require_auth] = lambda: Employee(id=str(uuid.uuid4()), role=UserRole.ADMIN)
+
+    response = await client.get(path, headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0].startswith("id,")
@@ -0,0 +1,25 @@
+import importlib.util
+from pathlib import Path
+import pytest
+
+# The CI script is the single definition of the budget and the deferred modules
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "check_import_time.py"
+_spec = importlib.util.spec_from_file_location("check_import_time", _SCRIPT)
+check_import_time = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_import_time)
+
+@pytest.fixture(scope="module")
+def app_import():
+    """(cumulative microseconds, imported modules) for a cold import of app.main in a fresh interpreter"""
+    return check_import_time.measure("app.main")
+
+def test_startup_defers_heavy_modules(app_import):
+    _, imported = app_import
+
+    assert check_import_time.eager_deferred_modules(imported) == []
+
+@pytest.mark.skipif(check_import_time.BUDGET_MS is None, reason="set IMPORT_TIME_BUDGET_MS to check wall-clock import time")
+def test_startup_import_within_budget(app_import):
+    total_us, _ = app_import
+
+    assert total_us / 1000 <= check_import_time.BUDGET_MS
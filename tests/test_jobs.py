@@ -0,0 +1,139 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.core.config import settings
+from app.models.employee import Employee
+from app.models.job import Job, JobStatus
+from app.services import jobs
+from app.services.jobs import JobKind, JobOutcome, JobWorker
+
+@pytest.fixture
+async def queued_job(async_db):
+    employee = Employee(id=str(uuid.uuid4()), username="owner", password_hash="x", name="Owner")
+    job = Job(id=str(uuid.uuid4()), kind="test_job", status=JobStatus.QUEUED, created_by=employee.id)
+    async_db.add_all([employee, job])
+    await async_db.commit()
+    return job
+
+async def _reload(db, job):
+    return await db.get(Job, job.id, populate_existing=True)
+
+async def _expire_lease(db, job):
+    stored = await _reload(db, job)
+    stored.heartbeat_at = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_STALE_SECONDS + 1)
+    await db.commit()
+
+async def test_leased_job_is_not_claimed_again(queued_job):
+    first, second = JobWorker("worker-a"), JobWorker("worker-b")
+
+    claimed = await first.claim()
+
+    assert claimed.id == queued_job.id
+    assert claimed.worker_id == "worker-a"
+    assert await second.claim() is None
+    assert await first._update(claimed.id)
+
+async def test_job_with_expired_lease_is_claimed_again(async_db, queued_job):
+    first, second = JobWorker("worker-a"), JobWorker("worker-b")
+    await first.claim()
+    await _expire_lease(async_db, queued_job)
+
+    reclaimed = await second.claim()
+
+    assert reclaimed.id == queued_job.id
+    assert reclaimed.worker_id == "worker-b"
+    assert reclaimed.attempts == 2
+    # The first worker's writes are now rejected
+    assert not await first._update(queued_job.id, progress={"processed": 1})
+
+async def test_job_out_of_attempts_is_failed_instead(async_db, queued_job, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 1)
+    await JobWorker("worker-a").claim()
+    await _expire_lease(async_db, queued_job)
+
+    assert await JobWorker("worker-b").claim() is None
+    stored = await _reload(async_db, queued_job)
+    assert stored.status == JobStatus.FAILED
+    assert stored.finished_at is not None
+
+async def test_heartbeat_keeps_a_running_job_leased(async_db, queued_job, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_SECONDS", 0.1)
+    monkeypatch.setattr(settings, "JOB_STALE_SECONDS", 0.5)
+    claims = []
+
+    async def slow_job(job, progress):
+        # Outlives the stale window several times over; only the heartbeat keeps the lease
+        for _ in range(6):
+            await asyncio.sleep(0.25)
+            claims.append(await JobWorker("worker-b").claim())
+        return JobOutcome({"ok": True})
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "test_job", JobKind(slow_job))
+    worker = JobWorker("worker-a")
+
+    await worker.run(await worker.claim())
+
+    assert claims == [None] * 6
+    stored = await _reload(async_db, queued_job)
+    assert stored.status == JobStatus.SUCCEEDED
+    assert stored.worker_id == "worker-a"
+    assert stored.attempts == 1
+
+async def test_run_that_lost_its_lease_is_cancelled(async_db, queued_job, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_SECONDS", 0.05)
+    steps = []
+
+    async def endless_job(job, progress):
+        while True:
+            steps.append(len(steps))
+            await asyncio.sleep(0.02)
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "test_job", JobKind(endless_job))
+    worker = JobWorker("worker-a")
+    claimed = await worker.claim()
+    stored = await _reload(async_db, queued_job)
+    stored.worker_id = "worker-b"
+    await async_db.commit()
+
+    await asyncio.wait_for(worker.run(claimed), 5)
+
+    stored = await _reload(async_db, queued_job)
+    assert stored.status == JobStatus.RUNNING
+    assert stored.worker_id == "worker-b"
+    assert stored.finished_at is None
+    stopped_at = len(steps)
+    await asyncio.sleep(0.1)
+    assert len(steps) == stopped_at
+
+async def test_input_is_deleted_once_the_job_finishes(async_db, queued_job, monkeypatch):
+    deleted = []
+
+    async def quick_job(job, progress):
+        return JobOutcome({"ok": True})
+
+    async def delete_file(key):
+        deleted.append(key)
+        return True
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "test_job", JobKind(quick_job))
+    monkeypatch.setattr(jobs.job_file_service, "delete_file", delete_file)
+    stored = await _reload(async_db, queued_job)
+    stored.input_key = f"job_files/jobs/{queued_job.id}/leads.csv"
+    await async_db.commit()
+    worker = JobWorker("worker-a")
+
+    await worker.run(await worker.claim())
+
+    assert deleted == [f"job_files/jobs/{queued_job.id}/leads.csv"]
+
+def test_local_job_files_are_not_under_the_public_uploads_mount():
+    from app.services.file_upload import file_upload_service, job_file_service
+    from app.services.storage import LocalStorage
+
+    if not isinstance(file_upload_service.storage, LocalStorage):
+        pytest.skip("job files share the configured bucket")
+    public = file_upload_service.storage.root
+    private = job_file_service.storage.root
+    assert private == settings.JOB_FILES_DIR
+    assert not private.startswith(f"{public}/") and private != public
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import pytest
+from app.core.password_pool import PasswordPool
+from app.utils.errors import AppException
+
+@pytest.fixture
+def release():
+    """Event the pool's blocking job waits on; always set, so no worker thread outlives the test"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+async def test_cancelled_queued_jobs_leave_the_queue(release):
+    pool = PasswordPool(max_workers=1, max_queue=4)
+    blocker = asyncio.ensure_future(pool.run(release.wait))
+    waiting = [asyncio.ensure_future(pool.run(lambda: "hashed")) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    assert pool.snapshot()["queued"] == 3
+
+    # Requests that disconnect while their job is still queued
+    for task in waiting:
+        task.cancel()
+    await asyncio.gather(*waiting, return_exceptions=True)
+    release.set()
+    await blocker
+
+    snapshot = pool.snapshot()
+    assert snapshot["queued"] == 0
+    assert snapshot["running"] == 0
+    assert snapshot["completed"] == 1
+    # The whole queue is available again
+    assert await asyncio.gather(*(pool.run(lambda: "hashed") for _ in range(4))) == ["hashed"] * 4
+
+async def test_full_queue_is_rejected(release):
+    pool = PasswordPool(max_workers=1, max_queue=1)
+    blocker = asyncio.ensure_future(pool.run(release.wait))
+    await asyncio.sleep(0.05)
+    queued = asyncio.ensure_future(pool.run(lambda: "hashed"))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(AppException) as raised:
+        await pool.run(lambda: "hashed")
+
+    assert raised.value.code == "SERVER_BUSY"
+    release.set()
+    await blocker
+    assert await queued == "hashed"
+    assert pool.snapshot()["queued"] == 0
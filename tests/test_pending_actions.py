@@ -0,0 +1,72 @@
+import json
+import uuid
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import event
+from app.api.deps import get_current_user
+from app.api.v1.endpoints import pending_actions
+from app.core.database import async_engine
+from app.models.employee import Employee, UserRole
+from app.models.pending_action import ActionStatus, ActionType, PendingAction
+
+SEEDED = 60
+
+@pytest.fixture
+def admin(sync_db):
+    """An admin plus SEEDED pending actions, each from its own requester"""
+    admin = Employee(id=str(uuid.uuid4()), username="admin", password_hash="x", name="Admin", role=UserRole.ADMIN)
+    sync_db.add(admin)
+    for n in range(SEEDED):
+        requester = Employee(id=str(uuid.uuid4()), username=f"employee{n}", password_hash="x", name=f"Employee {n}")
+        sync_db.add(requester)
+        sync_db.add(PendingAction(
+            id=str(uuid.uuid4()),
+            module="leads",
+            action_type=ActionType.CREATE,
+            payload=json.dumps({"n": n}),
+            requested_by=requester.id,
+            status=ActionStatus.PENDING,
+            reviewed_by=admin.id
+        ))
+    sync_db.commit()
+    return Employee(id=admin.id, role=UserRole.ADMIN)
+
+@pytest.fixture
+async def client(admin, async_db):
+    app = FastAPI()
+    app.include_router(pending_actions.router, prefix="/pending-actions")
+    app.dependency_overrides[get_current_user] = lambda: admin
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+async def _list_statements(client: AsyncClient, page_size: int):
+    """GET one page of pending actions; returns the response body and the SQL statements it ran"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get("/pending-actions/", params={"page_size": page_size})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return response.json(), statements
+
+async def test_list_query_count_does_not_grow_with_page_size(client):
+    one, one_statements = await _list_statements(client, 1)
+    fifty, fifty_statements = await _list_statements(client, 50)
+
+    assert len(one["data"]) == 1
+    assert len(fifty["data"]) == 50
+    assert one_statements
+    assert len(fifty_statements) == len(one_statements)
+
+async def test_list_resolves_requester_and_reviewer_names(client):
+    body, _ = await _list_statements(client, 50)
+
+    for action in body["data"]:
+        assert action["requested_by_name"].startswith("Employee ")
+        assert action["reviewed_by_name"] == "Admin"
@@ -0,0 +1,57 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import MemoryRateLimiter, RateLimitMiddleware
+
+async def test_active_clients_are_not_evicted_when_the_table_is_full():
+    limiter = MemoryRateLimiter(max_keys=2)
+    assert (await limiter.hit("a", 2, 60)).allowed
+    assert (await limiter.hit("a", 2, 60)).allowed
+    assert (await limiter.hit("b", 2, 60)).allowed
+
+    # A newcomer goes uncounted rather than resetting a client that is out of tokens
+    assert (await limiter.hit("c", 2, 60)).allowed
+    assert not (await limiter.hit("a", 2, 60)).allowed
+
+async def test_refilled_buckets_make_room_for_new_clients():
+    limiter = MemoryRateLimiter(max_keys=1)
+    await limiter.hit("a", 1, 0.05)
+    await asyncio.sleep(0.06)
+
+    await limiter.hit("b", 1, 0.05)
+
+    assert not (await limiter.hit("b", 1, 0.05)).allowed
+
+async def test_middleware_limits_api_requests(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_API", 2)
+    monkeypatch.setattr(rate_limit, "rate_limiter", MemoryRateLimiter(100))
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+
+    @app.get("/api/rows")
+    async def rows():
+        async def body():
+            for n in range(3):
+                yield f"{n}\n"
+        return StreamingResponse(body(), media_type="text/plain")
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        first = await client.get("/api/rows")
+        second = await client.get("/api/rows")
+        third = await client.get("/api/rows")
+        health = await client.get("/health")
+
+    assert first.text == "0\n1\n2\n"
+    assert first.headers["X-RateLimit-Limit"] == "2"
+    assert [first.headers["X-RateLimit-Remaining"], second.headers["X-RateLimit-Remaining"]] == ["1", "0"]
+    assert third.status_code == 429
+    assert third.json()["error"]["code"] == "RATE_LIMITED"
+    assert int(third.headers["Retry-After"]) > 0
+    assert health.status_code == 200
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import text
+from app.core import schema
+from app.core.config import settings
+from app.core.database import async_engine, engine
+
+@pytest.fixture
+async def check_mode(monkeypatch, db_schema):
+    monkeypatch.setattr(settings, "DB_SCHEMA_MODE", "check")
+    yield
+    await async_engine.dispose()
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+
+def _record_migrations(versions):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE schema_migrations (version TEXT PRIMARY KEY)"))
+        for version in versions:
+            conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:version)"), {"version": version})
+
+@pytest.mark.parametrize("url, env, mode", [
+    ("sqlite:///crm.db", "production", "create"),
+    ("postgresql://db/crm", "development", "check"),
+    ("postgresql://db/crm", "production", "check"),
+])
+def test_auto_creates_only_on_sqlite(monkeypatch, url, env, mode):
+    monkeypatch.setattr(settings, "DB_SCHEMA_MODE", "auto")
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    monkeypatch.setattr(settings, "ENV", env)
+
+    assert schema.resolve_schema_mode() == mode
+
+async def test_check_fails_without_migration_ledger(check_mode):
+    with pytest.raises(RuntimeError, match="not found"):
+        await schema.prepare_schema(async_engine)
+
+async def test_check_fails_on_missing_migration(check_mode, monkeypatch):
+    monkeypatch.setattr(schema, "MIGRATION_LEDGER", "schema_migrations")
+    expected = schema.expected_migrations()
+    _record_migrations(expected[:-1])
+
+    with pytest.raises(RuntimeError, match=expected[-1]):
+        await schema.prepare_schema(async_engine)
+
+async def test_check_passes_when_every_migration_is_applied(check_mode, monkeypatch):
+    monkeypatch.setattr(schema, "MIGRATION_LEDGER", "schema_migrations")
+    _record_migrations(schema.expected_migrations())
+
+    await schema.prepare_schema(async_engine)
+
+async def test_check_fails_without_shipped_migrations(check_mode, monkeypatch, tmp_path):
+    monkeypatch.setattr(schema, "_MIGRATIONS_DIR", tmp_path)
+
+    with pytest.raises(RuntimeError, match="No migrations"):
+        await schema.prepare_schema(async_engine)
@@ -0,0 +1,13 @@
+from app.core.security import create_access_token, verify_token
+
+def test_verified_payload_is_not_shared_between_callers():
+    token = create_access_token({"sub": "employee-1"})
+
+    first = verify_token(token)
+    first["sub"] = "someone-else"
+    first["role"] = "admin"
+
+    for _ in range(2):
+        payload = verify_token(token)
+        assert payload["sub"] == "employee-1"
+        assert "role" not in payload
@@ -0,0 +1,101 @@
+import logging
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from pydantic import ValidationError
+from app.schemas.document import DocumentPresignRequest
+from app.services.storage import LocalStorage, S3Storage
+from app.utils.errors import AppException
+
+class FakeS3Client:
+    """Records calls; upload_part and abort_multipart_upload fail on request"""
+
+    def __init__(self, fail_part=False, fail_abort=False):
+        self.calls = []
+        self.fail_part = fail_part
+        self.fail_abort = fail_abort
+
+    def create_multipart_upload(self, **kwargs):
+        self.calls.append("create_multipart_upload")
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, **kwargs):
+        self.calls.append("upload_part")
+        if self.fail_part:
+            raise ClientError({"Error": {"Code": "InternalError", "Message": "boom"}}, "UploadPart")
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.calls.append("complete_multipart_upload")
+
+    def abort_multipart_upload(self, **kwargs):
+        self.calls.append("abort_multipart_upload")
+        if self.fail_abort:
+            raise ClientError({"Error": {"Code": "NoSuchUpload", "Message": "gone"}}, "AbortMultipartUpload")
+
+def _storage(client):
+    storage = S3Storage("bucket", "https://cdn.example.com", max_connections=1)
+    storage._client = client
+    return storage
+
+async def _chunks(*chunks, error=None):
+    for chunk in chunks:
+        yield chunk
+    if error:
+        raise error
+
+async def test_completed_upload_is_not_aborted():
+    client = FakeS3Client()
+
+    saved = await _storage(client).save(_chunks(b"abc"), "docs/a.pdf")
+
+    assert saved == {"r2_key": "docs/a.pdf", "public_url": "https://cdn.example.com/docs/a.pdf"}
+    assert client.calls == ["create_multipart_upload", "upload_part", "complete_multipart_upload"]
+
+async def test_client_error_aborts_and_raises_http_500():
+    client = FakeS3Client(fail_part=True)
+
+    with pytest.raises(HTTPException) as raised:
+        await _storage(client).save(_chunks(b"abc"), "docs/a.pdf")
+
+    assert raised.value.status_code == 500
+    assert client.calls[-1] == "abort_multipart_upload"
+
+async def test_failed_abort_is_logged_and_original_error_propagates(caplog):
+    client = FakeS3Client(fail_abort=True)
+    too_large = HTTPException(status_code=413, detail="File too large")
+
+    with caplog.at_level(logging.ERROR), pytest.raises(HTTPException) as raised:
+        await _storage(client).save(_chunks(b"abc", error=too_large), "docs/a.pdf")
+
+    assert raised.value is too_large
+    assert client.calls[-1] == "abort_multipart_upload"
+    assert "Failed to abort multipart upload upload-1" in caplog.text
+
+@pytest.mark.parametrize("key", ["../escaped.txt", "leads/../../escaped.txt", "/tmp/escaped.txt"])
+async def test_local_storage_rejects_keys_outside_its_root(tmp_path, key):
+    storage = LocalStorage(root=str(tmp_path / "uploads"))
+
+    with pytest.raises(AppException) as raised:
+        await storage.save(_chunks(b"data"), key)
+    with pytest.raises(AppException):
+        await storage.presign_upload(key, None, 60)
+
+    assert raised.value.code == "INVALID_KEY"
+    assert list(tmp_path.iterdir()) == []
+
+async def test_local_storage_saves_keys_inside_its_root(tmp_path):
+    storage = LocalStorage(root=str(tmp_path / "uploads"))
+
+    stored = await storage.save(_chunks(b"data"), "leads/L-1/file.txt")
+
+    assert (tmp_path / "uploads" / "leads" / "L-1" / "file.txt").read_bytes() == b"data"
+    assert stored["r2_key"] == f"{tmp_path}/uploads/leads/L-1/file.txt"
+
+@pytest.mark.parametrize("field", ["entity", "entity_id"])
+@pytest.mark.parametrize("value", ["..", "../uploads", "a/b", ""])
+def test_presign_request_rejects_path_segments(field, value):
+    payload = {"entity": "leads", "entity_id": "L-1", "filename": "a.pdf", field: value}
+
+    with pytest.raises(ValidationError):
+        DocumentPresignRequest(**payload)